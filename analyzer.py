@@ -1,5 +1,7 @@
 """Analytics engine for Instagram profiles"""
 
+from records import FollowerList, iter_usernames
+
 class ProfileAnalytics:
     """Analyze Instagram profile metrics"""
     
@@ -97,13 +99,16 @@ class ComparativeAnalytics:
     @staticmethod
     def find_mutual_followers(followers_list1, followers_list2):
         """Find mutual followers between two follower lists"""
-        usernames1 = {f["username"] for f in followers_list1}
-        usernames2 = {f["username"] for f in followers_list2}
+        usernames1 = set(iter_usernames(followers_list1))
+        usernames2 = set(iter_usernames(followers_list2))
         
         mutual = usernames1.intersection(usernames2)
         
         # Reconstruct mutual follower objects
-        mutual_followers = [f for f in followers_list1 if f["username"] in mutual]
+        if isinstance(followers_list1, FollowerList):
+            mutual_followers = FollowerList(row for row in followers_list1.rows() if row[0] in mutual)
+        else:
+            mutual_followers = [f for f in followers_list1 if f["username"] in mutual]
         
         return {
             "mutual_count": len(mutual),
@@ -0,0 +1,161 @@
+"""Offline pipeline benchmark
+
+Times the follower fetch, database, export and full pipeline stages
+against synthetic profiles and writes the results as JSON.
+
+Usage (from the repository root):
+    python -m benchmarks.run --sizes 10000,100000,1000000
+    python -m benchmarks.run --compare benchmarks/results/old.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from benchmarks.synthetic import SyntheticOSINT, PAGE_LATENCY
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+DEFAULT_SIZES = "10000,100000"
+DEFAULT_FOLLOWEES = 1000
+EXPORT_FORMATS = "json,csv,html"
+
+
+class StageTimer:
+    """Measure wall time and peak traced memory of benchmark stages"""
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.rows = []
+
+    def run(self, size, stage, items, func, *args):
+        if self.trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            result = func(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] if self.trace_memory else None
+            if self.trace_memory:
+                tracemalloc.stop()
+
+        self.rows.append({
+            "followers": size,
+            "stage": stage,
+            "seconds": round(elapsed, 4),
+            "items_per_s": round(items / elapsed, 1) if elapsed else None,
+            "peak_bytes": peak
+        })
+        print(f"  {stage:<10} {elapsed:9.3f}s  {items / max(elapsed, 1e-9):12.0f} items/s"
+              + (f"  peak {peak / 1048576:8.1f} MiB" if peak is not None else ""))
+        return result
+
+
+def bench_size(timer, size, followees, latency):
+    """Run every stage for one follower count in a scratch directory"""
+    items = size + followees
+    osint = SyntheticOSINT(size, followees, latency)
+    target = f"synthetic_{size}"
+    print(f"{size} followers / {followees} following")
+
+    profile = osint.fetch_profile(target)
+    followers, following = timer.run(size, "fetch", items, lambda: (
+        osint.fetch_followers(profile), osint.fetch_following(profile)))
+    timer.run(size, "database", items, osint.save_to_database,
+              profile, followers, following, None, {'db': True})
+    results = {"profile": profile, "followers": followers, "following": following, "analytics": None}
+    timer.run(size, "export", items, osint.export_results, results, target, EXPORT_FORMATS)
+    del followers, following, results
+
+    def pipeline():
+        results = osint.process_profile(target, {'db': True, 'analyze': True, 'no_download': True})
+        osint.export_results(results, target, EXPORT_FORMATS)
+
+    timer.run(size, "pipeline", items, pipeline)
+    timer.run(size, "stream", items, osint.process_profile, target,
+              {'db': True, 'analyze': True, 'no_download': True, 'stream': True,
+               'export_formats': EXPORT_FORMATS})
+
+
+def git_revision():
+    """Current commit of the repository, if available"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(RESULTS_DIR), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(baseline_path, rows):
+    """Print time and memory ratios against an earlier results file"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {(r["followers"], r["stage"]): r for r in json.load(f)["results"]}
+
+    print(f"\nCompared to {baseline_path} (ratio < 1 is better)")
+    for row in rows:
+        old = baseline.get((row["followers"], row["stage"]))
+        if not old:
+            continue
+        line = f"  {row['followers']:>8} {row['stage']:<10} time x{row['seconds'] / max(old['seconds'], 1e-9):.2f}"
+        if row["peak_bytes"] and old.get("peak_bytes"):
+            line += f"  memory x{row['peak_bytes'] / old['peak_bytes']:.2f}"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmark of the OSINT pipeline")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f'Comma separated follower counts (default: {DEFAULT_SIZES})')
+    parser.add_argument('--followees', type=int, default=DEFAULT_FOLLOWEES,
+                        help=f'Following count of each synthetic target (default: {DEFAULT_FOLLOWEES})')
+    parser.add_argument('--latency', type=float, default=PAGE_LATENCY * 1000,
+                        help='Simulated latency per page request in milliseconds (default: 0)')
+    parser.add_argument('--no-memory', action='store_true', help='Skip tracemalloc (faster, no peak memory)')
+    parser.add_argument('--output', help='Results file (default: benchmarks/results/bench_<timestamp>.json)')
+    parser.add_argument('--compare', help='Earlier results file to compare against')
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    timer = StageTimer(trace_memory=not args.no_memory)
+    output = os.path.abspath(args.output or os.path.join(
+        RESULTS_DIR, f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"))
+    compare_path = os.path.abspath(args.compare) if args.compare else None
+
+    # Databases, checkpoints and exports are written relative to the cwd
+    cwd = os.getcwd()
+    for size in sizes:
+        scratch = tempfile.mkdtemp(prefix="osint_bench_")
+        os.chdir(scratch)
+        try:
+            bench_size(timer, size, args.followees, args.latency / 1000)
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    report = {
+        "created": datetime.now().isoformat(),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {"sizes": sizes, "followees": args.followees, "latency_ms": args.latency,
+                   "memory": not args.no_memory, "export_formats": EXPORT_FORMATS},
+        "results": timer.rows
+    }
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if compare_path:
+        compare(compare_path, timer.rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
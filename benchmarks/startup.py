@@ -0,0 +1,96 @@
+"""Cold-start benchmark of the instaOSINT.py command line
+
+Each command is run in a fresh interpreter several times; the report
+shows wall times and whether the scraping stack (instaloader) was
+imported, which the lightweight paths must avoid.
+
+Usage (from the repository root):
+    python -m benchmarks.startup --runs 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from benchmarks.run import RESULTS_DIR, git_revision
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_POINT = os.path.join(REPO_DIR, "instaOSINT.py")
+HEAVY_MODULES = ("instaloader", "requests", "processor")
+
+# name -> arguments of instaOSINT.py, or None for a bare interpreter
+COMMANDS = {
+    "python": None,
+    "help": ["--help"],
+    "invalid_args": ["-t", "a", "-f", "b"],
+    "enqueue": ["-t", "startup_bench", "--enqueue", "--quiet"],
+    "import_processor": "import processor"
+}
+
+
+def command_line(args):
+    if args is None:
+        return [sys.executable, "-c", "pass"]
+    if isinstance(args, str):
+        return [sys.executable, "-c", args]
+    return [sys.executable, ENTRY_POINT] + args
+
+
+def imported_heavy_modules(args, cwd):
+    """Heavy top-level modules imported by a command, via -X importtime"""
+    cmd = command_line(args)
+    proc = subprocess.run([cmd[0], "-X", "importtime"] + cmd[1:], capture_output=True, text=True,
+                          cwd=cwd, env={**os.environ, "PYTHONPATH": REPO_DIR})
+    modules = {line.rsplit("|", 1)[-1].strip() for line in proc.stderr.splitlines() if line.startswith("import time:")}
+    return sorted(m for m in HEAVY_MODULES if m in modules)
+
+
+def time_command(args, runs, cwd):
+    """Wall times in milliseconds of `runs` fresh processes"""
+    cmd = command_line(args)
+    env = {**os.environ, "PYTHONPATH": REPO_DIR}
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=cwd, env=env)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start benchmark of instaOSINT.py")
+    parser.add_argument('--runs', type=int, default=10, help='Processes per command (default: 10)')
+    parser.add_argument('--output', help='Results file (default: benchmarks/results/startup_<timestamp>.json)')
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="osint_startup_") as scratch:
+        for name, command in COMMANDS.items():
+            times = time_command(command, args.runs, scratch)
+            heavy = imported_heavy_modules(command, scratch)
+            results.append({
+                "command": name,
+                "min_ms": round(min(times), 1),
+                "median_ms": round(statistics.median(times), 1),
+                "max_ms": round(max(times), 1),
+                "heavy_imports": heavy
+            })
+            print(f"  {name:<18} min {min(times):7.1f} ms  median {statistics.median(times):7.1f} ms"
+                  f"  {'loads ' + ', '.join(heavy) if heavy else 'lightweight'}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"startup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({"created": datetime.now().isoformat(), "revision": git_revision(),
+                   "python": sys.version.split()[0], "runs": args.runs, "results": results}, f, indent=2)
+    print(f"\nResults written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""Synthetic stand-ins for instaloader profiles and their context
+
+Follower and following pages are generated locally and served through a
+real instaloader NodeIterator, so paging, checkpointing and the rest of
+the pipeline run exactly as against Instagram, without any network."""
+
+import random
+import time
+from instaloader import NodeIterator
+from processor import InstagramOSINT
+
+PAGE_LATENCY = 0.0  # Seconds slept per synthetic page request
+
+
+class SyntheticContext:
+    """Answers graphql_query calls with generated edge pages"""
+
+    username = "benchmark"
+
+    def __init__(self, latency=PAGE_LATENCY, seed=0, on_query=None):
+        self.latency = latency
+        self.seed = seed
+        self.on_query = on_query
+        self.requests = 0
+
+    def graphql_query(self, query_hash, variables, referer=None):
+        self.requests += 1
+        if self.on_query:
+            self.on_query(query_hash)
+        if self.latency:
+            time.sleep(self.latency)
+
+        total = variables["total"]
+        start = int(variables.get("after") or 0)
+        end = min(start + variables["first"], total)
+        # Distinct id ranges per edge keep followers and following apart
+        offset = variables["id_offset"]
+        edges = [{"node": synthetic_node(offset + i, self.seed)} for i in range(start, end)]
+        return {"data": {"user": {"edge": {
+            "count": total,
+            "edges": edges,
+            "page_info": {"has_next_page": end < total, "end_cursor": str(end)}
+        }}}}
+
+
+def synthetic_node(user_id, seed=0):
+    """GraphQL user node with a deterministic name for `user_id`"""
+    rng = random.Random(user_id * 31 + seed)
+    return {
+        "id": str(user_id),
+        "username": f"user_{user_id:x}",
+        "full_name": f"Synthetic User {rng.randint(0, 99999)}"
+    }
+
+
+class SyntheticUser:
+    """Minimal Profile replacement for follower/following nodes"""
+
+    __slots__ = ("userid", "username", "full_name")
+
+    def __init__(self, node):
+        self.userid = int(node["id"])
+        self.username = node["username"]
+        self.full_name = node["full_name"]
+
+
+class SyntheticProfile:
+    """Target profile with `followers` followers and `followees` followees"""
+
+    def __init__(self, context, username="synthetic_target", followers=10000, followees=500, mediacount=120):
+        self.context = context
+        self.username = username
+        self.userid = 1
+        self.full_name = "Synthetic Target"
+        self.biography = "Generated for offline benchmarks"
+        self.external_url = None
+        self.is_private = False
+        self.is_business_account = False
+        self.business_category_name = None
+        self.followers = followers
+        self.followees = followees
+        self.mediacount = mediacount
+        self.profile_pic_url = "https://example.invalid/pic.jpg"
+
+    def _edge_iterator(self, total, id_offset):
+        return NodeIterator(
+            self.context,
+            "synthetic",
+            lambda d: d["data"]["user"]["edge"],
+            SyntheticUser,
+            {"id": self.userid, "total": total, "id_offset": id_offset},
+            None
+        )
+
+    def get_followers(self):
+        return self._edge_iterator(self.followers, 10 ** 9)
+
+    def get_followees(self):
+        return self._edge_iterator(self.followees, 2 * 10 ** 9)
+
+    def get_posts(self):
+        return iter(())
+
+
+class SyntheticOSINT(InstagramOSINT):
+    """InstagramOSINT resolving every target to a synthetic profile"""
+
+    def __init__(self, followers, followees, latency=PAGE_LATENCY, **kwargs):
+        kwargs.setdefault("quiet", True)
+        super().__init__(**kwargs)
+        self.context = SyntheticContext(latency, on_query=self.metrics.count_request)
+        self.synthetic_sizes = (followers, followees)
+        self.is_logged_in = True
+
+    def fetch_profile(self, target_username, use_cache=True):
+        followers, followees = self.synthetic_sizes
+        return SyntheticProfile(self.context, target_username, followers, followees)
@@ -0,0 +1,122 @@
+"""Persistent TTL cache for Instagram profile metadata"""
+
+import json
+import threading
+import time
+import instaloader
+from database import get_connection, release_connection
+
+CACHE_FILE = "profile_cache.db"
+DEFAULT_TTL = 3600  # Seconds a cached profile stays fresh
+DEFAULT_MAX_ENTRIES = 1000
+
+
+class ProfileCache:
+    """SQLite-backed profile cache keyed by username and user_id
+
+    Entries older than `ttl` seconds are ignored, and the least recently
+    used entries are evicted once more than `max_entries` are stored."""
+
+    def __init__(self, db_name=CACHE_FILE, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, refresh=False):
+        self.db_name = db_name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.init_cache()
+
+    def init_cache(self):
+        """Initialize cache table"""
+        conn = get_connection(self.db_name)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS profile_cache (
+                username TEXT PRIMARY KEY,
+                user_id INTEGER,
+                data TEXT,
+                fetched_at REAL,
+                last_access REAL
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_profile_cache_user_id ON profile_cache(user_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_profile_cache_last_access ON profile_cache(last_access)')
+
+        conn.commit()
+
+    def _count(self, hit):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _lookup(self, context, column, value):
+        """Return a cached Profile where `column` matches, or None"""
+        if self.refresh or not self.ttl:
+            self._count(False)
+            return None
+
+        now = time.time()
+        conn = get_connection(self.db_name)
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(f'SELECT username, data, fetched_at FROM profile_cache WHERE {column} = ?', (value,))
+            row = cursor.fetchone()
+            if not row or now - row[2] > self.ttl:
+                self._count(False)
+                return None
+
+            cursor.execute('UPDATE profile_cache SET last_access = ? WHERE username = ?', (now, row[0]))
+            conn.commit()
+            self._count(True)
+            return instaloader.load_structure(context, json.loads(row[1]))
+        finally:
+            release_connection(conn)
+
+    def get(self, context, username):
+        """Cached profile for a username"""
+        return self._lookup(context, "username", username.lower())
+
+    def get_by_id(self, context, user_id):
+        """Cached profile for a user id"""
+        return self._lookup(context, "user_id", user_id)
+
+    def put(self, profile):
+        """Store a freshly fetched profile and evict old entries"""
+        if not self.ttl:
+            return
+
+        now = time.time()
+        data = json.dumps(instaloader.get_json_structure(profile))
+        conn = get_connection(self.db_name)
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('''
+                INSERT OR REPLACE INTO profile_cache (username, user_id, data, fetched_at, last_access)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (profile.username.lower(), profile.userid, data, now, now))
+
+            # Drop expired entries, then least recently used beyond the size bound
+            cursor.execute('DELETE FROM profile_cache WHERE fetched_at < ?', (now - self.ttl,))
+            cursor.execute('''
+                DELETE FROM profile_cache WHERE username IN (
+                    SELECT username FROM profile_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )
+            ''', (self.max_entries,))
+            conn.commit()
+        finally:
+            release_connection(conn)
+
+    def stats(self):
+        """Hit/miss counters for this run"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total * 100, 1) if total else 0
+        }
@@ -0,0 +1,97 @@
+"""Resumable crawl checkpoints for follower/following iteration"""
+
+import json
+import os
+from datetime import datetime
+from instaloader import FrozenNodeIterator
+from instaloader.exceptions import InvalidArgumentException
+from records import record_dict
+
+CHECKPOINT_DIR = "checkpoints"
+
+
+class CrawlCheckpoint:
+    """Frozen iterator state plus a spool of records already fetched
+
+    The spool lets a resumed crawl return the complete list: records from
+    the interrupted run are replayed from disk, then the thawed iterator
+    continues with the pages that are still missing."""
+
+    def __init__(self, target, edge, directory=CHECKPOINT_DIR):
+        self.directory = directory
+        self.state_path = os.path.join(directory, f"{target}_{edge}.json")
+        self.spool_path = os.path.join(directory, f"{target}_{edge}.jsonl")
+        self.spool = None
+
+    def resume(self, iterator):
+        """Thaw `iterator` from a saved checkpoint
+
+        Returns the number of spooled records to replay, 0 when there is
+        nothing (valid) to resume from."""
+        if not os.path.isfile(self.state_path) or not os.path.isfile(self.spool_path):
+            self.clear()
+            return 0
+
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            frozen = FrozenNodeIterator(**state["iterator"])
+            if frozen.best_before and datetime.fromtimestamp(frozen.best_before) < datetime.now():
+                raise InvalidArgumentException("checkpoint expired")
+            iterator.thaw(frozen)
+            return frozen.total_index
+        except (InvalidArgumentException, ValueError, KeyError, TypeError):
+            # Stale or mismatching checkpoint, start over
+            self.clear()
+            return 0
+
+    def replay(self, count):
+        """Yield the first `count` spooled records"""
+        if not count:
+            return
+        with open(self.spool_path, 'r', encoding='utf-8') as f:
+            for idx, line in enumerate(f):
+                if idx >= count:
+                    break
+                yield json.loads(line)
+
+    def open_spool(self, count):
+        """Open the spool for appending, dropping records past `count`"""
+        os.makedirs(self.directory, exist_ok=True)
+        if count:
+            # Records after the last checkpoint are fetched again
+            with open(self.spool_path, 'rb+') as f:
+                for _ in range(count):
+                    f.readline()
+                f.truncate(f.tell())
+        self.spool = open(self.spool_path, 'a' if count else 'w', encoding='utf-8')
+
+    def append(self, record):
+        """Spool a fetched record"""
+        self.spool.write(json.dumps(record_dict(record), ensure_ascii=False) + "\n")
+
+    def save(self, frozen):
+        """Persist the iterator position together with the spool"""
+        self.spool.flush()
+        state = {
+            "iterator": frozen._asdict(),
+            "records": frozen.total_index,
+            "saved_at": datetime.now().isoformat()
+        }
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def close(self):
+        """Close the spool file"""
+        if self.spool:
+            self.spool.close()
+            self.spool = None
+
+    def clear(self):
+        """Remove checkpoint and spool after a completed crawl"""
+        self.close()
+        for path in (self.state_path, self.spool_path):
+            if os.path.exists(path):
+                os.remove(path)
@@ -1,6 +1,7 @@
 """CLI argument parser and configuration"""
 
 import argparse
+from datetime import datetime, time
 
 def get_args():
     """Parse command line arguments"""
@@ -18,9 +19,29 @@ Examples:
   # Batch mode with multiple targets
   python instaOSINT.py -u myusername -p mypassword -f targets.txt
   
+  # Batch mode with 4 concurrent workers, at most 20 targets per minute
+  python instaOSINT.py -u myusername -p mypassword -f targets.txt --workers 4 --rate-limit 20
+  
+  # Queue targets, then process them with a long-running worker
+  python instaOSINT.py -f targets.txt --enqueue --db --analyze
+  python instaOSINT.py -u myusername --worker
+  
+  # Rotate targets across several accounts with saved sessions
+  python instaOSINT.py -u myusername -f targets.txt --accounts alt1,alt2 --workers 3
+  
   # Export to specific format
   python instaOSINT.py -u myusername -p mypassword -t targetusername -o html,json,csv
   
+  # Followers gained/lost since the previous run, and during March
+  python instaOSINT.py --churn targetusername
+  python instaOSINT.py --churn targetusername --since 2025-03-01 --until 2025-03-31 --churn-output march.csv
+  
+  # Refresh query planner statistics of the database
+  python instaOSINT.py --maintain analyze
+  
+  # Downsample history older than 90 days to daily/weekly rows and shrink the database
+  python instaOSINT.py --maintain compact --keep-detail 90
+  
   # Store data in database and analyze
   python instaOSINT.py -u myusername -p mypassword -t targetusername --db --analyze
         """
@@ -31,49 +52,185 @@ Examples:
     auth_group.add_argument('-u', '--username', help='Instagram username')
     auth_group.add_argument('-p', '--password', help='Instagram password')
     auth_group.add_argument('--no-session', action='store_true', help='Do not use saved session')
+    auth_group.add_argument('--accounts', help='Comma-separated usernames with saved sessions to rotate targets across')
+    auth_group.add_argument('--session-rate', type=float, default=10,
+                            help='Maximum targets per minute for each pooled account (default: 10)')
+    auth_group.add_argument('--quarantine', type=int, default=900,
+                            help='Seconds a throttled/challenged account is benched, doubling on repeat (default: 900)')
     
     # Target arguments
     target_group = parser.add_argument_group('Target')
     target_group.add_argument('-t', '--target', help='Single target username')
     target_group.add_argument('-f', '--file', help='File with list of target usernames (one per line)')
+    target_group.add_argument('--schedule', action='store_true',
+                              help='Deduplicate targets and process the stalest (per expected request) first, '
+                                   'based on the database')
+    target_group.add_argument('--fresh-within', type=float, metavar='HOURS',
+                              help='Skip targets updated in the database within HOURS (implies --schedule)')
+    
+    # Database maintenance arguments
+    db_group = parser.add_argument_group('Database')
+    db_group.add_argument('--maintain', choices=['analyze', 'optimize', 'compact'],
+                          help='Run database maintenance and exit (no login needed): analyze refreshes all index '
+                               'statistics, optimize analyzes what changed and checkpoints the WAL, compact '
+                               'downsamples old history, drops superseded analytics and reclaims the space')
+    db_group.add_argument('--keep-detail', type=int, default=30, metavar='DAYS',
+                          help='With --maintain compact, keep every history row of the last DAYS (default: 30)')
+    db_group.add_argument('--keep-daily', type=int, default=365, metavar='DAYS',
+                          help='With --maintain compact, keep one history row per day up to DAYS old, '
+                               'one per week beyond (default: 365)')
+    db_group.add_argument('--churn', metavar='TARGET',
+                          help='Show followers/following TARGET gained and lost between two stored snapshots and exit '
+                               '(default: the last two runs)')
+    db_group.add_argument('--churn-edge', choices=['followers', 'following', 'both'], default='followers',
+                          help='Edges to compare with --churn (default: followers)')
+    db_group.add_argument('--since', help='--churn start: snapshot ID or date (YYYY-MM-DD[THH:MM])')
+    db_group.add_argument('--until', help='--churn end: snapshot ID or date (YYYY-MM-DD[THH:MM], default: latest)')
+    db_group.add_argument('--churn-output', metavar='FILE', help='Write --churn rows to a CSV file instead of the console')
+    
+    # Worker arguments
+    worker_group = parser.add_argument_group('Worker')
+    worker_group.add_argument('--enqueue', action='store_true',
+                              help='Add the targets to the job queue in the database and exit (no login needed)')
+    worker_group.add_argument('--worker', action='store_true',
+                              help='Run as a long-lived worker processing queued jobs with one logged-in session')
+    worker_group.add_argument('--poll-interval', type=float, default=5,
+                              help='Seconds between queue checks when idle (default: 5)')
+    worker_group.add_argument('--max-attempts', type=int, default=3,
+                              help='Attempts per job before it is marked failed (default: 3)')
+    worker_group.add_argument('--exit-when-idle', action='store_true', help='Stop the worker once the queue is empty')
     
     # Output arguments
     output_group = parser.add_argument_group('Output')
     output_group.add_argument('-o', '--output', default='json', 
                              help='Export format(s): json, csv, html (comma-separated, default: json)')
     output_group.add_argument('-d', '--dir', default='.', help='Output directory (default: current)')
+    output_group.add_argument('--metrics-dir', default='metrics',
+                             help='Directory for per-stage run metrics in JSON and Prometheus format (default: metrics)')
+    output_group.add_argument('--no-metrics', action='store_true', help='Do not write run metrics files')
+    output_group.add_argument('--profile-run', nargs='?', const='profiles', metavar='DIR',
+                             help='Profile each target with cProfile and tracemalloc, writing hotspot and '
+                                  'allocation reports to DIR (default: profiles)')
     
     # Feature arguments
     feature_group = parser.add_argument_group('Features')
     feature_group.add_argument('--db', action='store_true', help='Store data in database')
     feature_group.add_argument('--analyze', action='store_true', help='Run analytics and calculate metrics')
     feature_group.add_argument('--compare', action='store_true', help='Compare multiple profiles')
+    feature_group.add_argument('--incremental', action='store_true',
+                               help='With --db, only fetch followers/following not already stored (stops at known ones)')
+    feature_group.add_argument('--fast-update', action='store_true',
+                               help='Only download posts/highlight items newer than the last downloaded ones')
     feature_group.add_argument('--no-download', action='store_true', help='Skip downloading posts/highlights')
     
     # Performance arguments
     perf_group = parser.add_argument_group('Performance')
     perf_group.add_argument('--limit-followers', type=int, help='Limit followers to fetch (default: all)')
     perf_group.add_argument('--limit-following', type=int, help='Limit following to fetch (default: all)')
+    perf_group.add_argument('--workers', type=int, default=1, help='Number of targets processed concurrently (default: 1)')
+    perf_group.add_argument('--rate-limit', type=float,
+                            help='Maximum targets started per minute across all workers, 0 for no limit '
+                                 '(default: 30, or no limit with --adaptive-rate)')
+    perf_group.add_argument('--adaptive-rate', action='store_true',
+                            help='Pace requests adaptively (AIMD backoff on 429s), learned per session across runs')
+    perf_group.add_argument('--parallel-stages', action='store_true',
+                            help='Fetch followers, following and media of each target concurrently')
+    perf_group.add_argument('--stage-concurrency', type=int, default=4,
+                            help='Maximum stages running at once with --parallel-stages (default: 4)')
+    perf_group.add_argument('--stream', action='store_true',
+                            help='Stream followers to the database and exports in chunks instead of holding them in memory')
+    perf_group.add_argument('--chunk-size', type=int, default=1000,
+                            help='Records per chunk with --stream (default: 1000)')
+    perf_group.add_argument('--checkpoint-every', type=int, default=25,
+                            help='Save resumable follower crawl state every N pages, 0 to disable (default: 25)')
+    perf_group.add_argument('--media-workers', type=int, default=4,
+                            help='Parallel post/highlight downloads per target (default: 4)')
+    perf_group.add_argument('--per-host', type=int, default=2,
+                            help='Maximum concurrent downloads per media host (default: 2)')
+    perf_group.add_argument('--cache-ttl', type=int, default=3600,
+                            help='Seconds a cached profile lookup stays valid, 0 to disable the cache (default: 3600)')
+    perf_group.add_argument('--cache-size', type=int, default=1000,
+                            help='Maximum profiles kept in the profile cache (default: 1000)')
+    perf_group.add_argument('--refresh', action='store_true', help='Ignore cached profiles and fetch them again')
     perf_group.add_argument('--quiet', action='store_true', help='Minimize console output')
     
     return parser.parse_args()
 
+def parse_snapshot_ref(value, end_of_day=False):
+    """Snapshot ID (int) or datetime from a --since/--until value
+    
+    A plain date stands for the start of that day, or its end with
+    `end_of_day`."""
+    if value is None or isinstance(value, (int, datetime)):
+        return value
+    if value.isdigit():
+        return int(value)
+    moment = datetime.fromisoformat(value)
+    if end_of_day and len(value) == 10:
+        moment = datetime.combine(moment.date(), time.max)
+    return moment
+
 def validate_args(args):
     """Validate parsed arguments"""
     errors = []
     
-    if not args.target and not args.file:
+    if not args.target and not args.file and not args.worker and not args.maintain and not args.churn:
         errors.append("Either --target or --file must be specified")
     
+    try:
+        args.since = parse_snapshot_ref(args.since)
+        args.until = parse_snapshot_ref(args.until, end_of_day=True)
+    except ValueError:
+        errors.append("--since and --until must be a snapshot ID or a date (YYYY-MM-DD[THH:MM])")
+    
+    if args.worker and args.enqueue:
+        errors.append("Cannot combine --worker and --enqueue")
+    
+    if args.keep_detail < 0 or args.keep_daily < 0:
+        errors.append("--keep-detail and --keep-daily cannot be negative")
+    
+    if args.fresh_within is not None and args.fresh_within < 0:
+        errors.append("--fresh-within cannot be negative")
+    
+    if args.poll_interval <= 0 or args.max_attempts < 1:
+        errors.append("--poll-interval must be positive and --max-attempts at least 1")
+    
     if args.target and args.file:
         errors.append("Cannot specify both --target and --file")
     
+    if args.incremental and not args.db:
+        errors.append("--incremental requires --db")
+    
     valid_formats = ['json', 'csv', 'html']
     formats = [f.strip().lower() for f in args.output.split(',')]
     invalid = [f for f in formats if f not in valid_formats]
     if invalid:
         errors.append(f"Invalid output format(s): {', '.join(invalid)}")
     
+    if args.session_rate < 0 or args.quarantine < 0:
+        errors.append("--session-rate and --quarantine cannot be negative")
+    
+    if args.workers < 1:
+        errors.append("--workers must be at least 1")
+    
+    if args.media_workers < 1 or args.per_host < 1:
+        errors.append("--media-workers and --per-host must be at least 1")
+    
+    if args.cache_ttl < 0 or args.cache_size < 1:
+        errors.append("--cache-ttl cannot be negative and --cache-size must be at least 1")
+    
+    if args.checkpoint_every < 0:
+        errors.append("--checkpoint-every cannot be negative")
+    
+    if args.chunk_size < 1:
+        errors.append("--chunk-size must be at least 1")
+    
+    if args.stage_concurrency < 1:
+        errors.append("--stage-concurrency must be at least 1")
+    
+    if args.rate_limit is not None and args.rate_limit < 0:
+        errors.append("--rate-limit cannot be negative")
+    
     if errors:
         for error in errors:
             print(f"Error: {error}")
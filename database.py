@@ -1,19 +1,315 @@
 """Database management for Instagram OSINT"""
 
+import itertools
+import os
 import sqlite3
-from datetime import datetime
+import threading
+import time
+from datetime import date, datetime, timedelta
 import json
+from records import FollowerList, iter_rows
+
+# Applied to every pooled connection
+CONNECTION_PRAGMAS = (
+    "PRAGMA auto_vacuum=INCREMENTAL",  # Only takes effect on new databases, must precede WAL
+    "PRAGMA journal_mode=WAL",  # Readers no longer block the writer and vice versa
+    "PRAGMA synchronous=NORMAL",  # Durable with WAL, without an fsync per commit
+    "PRAGMA cache_size=-16000",  # 16 MB page cache
+    "PRAGMA busy_timeout=30000"
+)
+STATEMENT_CACHE_SIZE = 256  # Prepared statements kept per connection
+WRITE_CHUNK_SIZE = 10000  # Rows per transaction in bulk follower writes
+EDGE_TYPES = ("followers", "following")
+CHURN_PAGE_SIZE = 1000  # Edges per page of churn results
+SERIES_METRICS = ("followers", "following", "posts")
+HISTORY_DETAIL_DAYS = 30  # Compaction keeps every profile_history row this recent
+HISTORY_DAILY_DAYS = 365  # then one row per day up to this age, one per week beyond
+LEGACY_RUN_GAP = 60  # Seconds without rows that separate two runs in the old followers/following tables
+
+
+def create_snapshot_tables(conn):
+    """Create the snapshot tables and import edges from followers/following"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS follower_snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            profile_username TEXT NOT NULL,
+            edge TEXT NOT NULL,
+            recorded_at TIMESTAMP,
+            complete BOOLEAN,
+            edge_count INTEGER,
+            added_count INTEGER,
+            removed_count INTEGER
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS follower_edges (
+            profile_username TEXT NOT NULL,
+            edge TEXT NOT NULL,
+            user_id INTEGER NOT NULL,
+            username TEXT,
+            full_name TEXT,
+            added_snapshot INTEGER NOT NULL REFERENCES follower_snapshots(id),
+            removed_snapshot INTEGER REFERENCES follower_snapshots(id)
+        )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_follower_snapshots_profile "
+                 "ON follower_snapshots(profile_username, edge, id)")
+    # At most one open interval per edge; also answers incremental-sync lookups
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_follower_edges_open "
+                 "ON follower_edges(profile_username, edge, user_id) WHERE removed_snapshot IS NULL")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_follower_edges_added "
+                 "ON follower_edges(profile_username, edge, added_snapshot)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_follower_edges_removed "
+                 "ON follower_edges(profile_username, edge, removed_snapshot) WHERE removed_snapshot IS NOT NULL")
+    
+    for edge, table, prefix in (("followers", "followers", "follower"), ("following", "following", "followee")):
+        profiles = conn.execute(f'''
+            SELECT profile_username, MAX(recorded_at) FROM {table} GROUP BY profile_username
+        ''').fetchall()
+        for profile_username, recorded_at in profiles:
+            # Only the last run is imported: the rows sharing its timestamp, or for
+            # older per-row timestamps, the rows after the last pause between rows
+            rows, run_start = conn.execute(f'''
+                SELECT COUNT(*), MIN(id) FROM {table} WHERE profile_username = ? AND recorded_at = ?
+            ''', (profile_username, recorded_at)).fetchone()
+            if rows < 2:
+                run_start = conn.execute(f'''
+                    SELECT MAX(id) FROM (
+                        SELECT id, (julianday(recorded_at) - julianday(LAG(recorded_at) OVER (ORDER BY id))) * 86400 AS gap
+                        FROM {table} WHERE profile_username = ?
+                    ) WHERE gap IS NULL OR gap > ?
+                ''', (profile_username, LEGACY_RUN_GAP)).fetchone()[0]
+            snapshot_id = conn.execute('''
+                INSERT INTO follower_snapshots (profile_username, edge, recorded_at, complete)
+                VALUES (?, ?, ?, 0)
+            ''', (profile_username, edge, recorded_at)).lastrowid
+            # Bare columns come from the newest row of each user (MAX(id))
+            added = conn.execute(f'''
+                INSERT INTO follower_edges (profile_username, edge, user_id, username, full_name, added_snapshot)
+                SELECT ?, ?, {prefix}_id, {prefix}_username, {prefix}_full_name, ? FROM (
+                    SELECT {prefix}_id, {prefix}_username, {prefix}_full_name, MAX(id) FROM {table}
+                    WHERE profile_username = ? AND id >= ? AND {prefix}_id IS NOT NULL GROUP BY {prefix}_id
+                )
+            ''', (profile_username, edge, snapshot_id, profile_username, run_start)).rowcount
+            conn.execute('''
+                UPDATE follower_snapshots SET edge_count = ?, added_count = ?, removed_count = 0 WHERE id = ?
+            ''', (added, added, snapshot_id))
+
+
+def create_daily_rollups(conn):
+    """Create profile_daily and fill it from profile_history"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS profile_daily (
+            username TEXT NOT NULL,
+            day TEXT NOT NULL,
+            followers INTEGER,
+            following INTEGER,
+            posts INTEGER,
+            followers_delta INTEGER,
+            following_delta INTEGER,
+            posts_delta INTEGER,
+            samples INTEGER,
+            PRIMARY KEY (username, day)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+        INSERT OR REPLACE INTO profile_daily
+        (username, day, followers, following, posts, followers_delta, following_delta, posts_delta, samples)
+        WITH days AS (
+            SELECT username, date(recorded_at) AS day, COUNT(*) AS samples, MIN(id) AS first_id, MAX(id) AS last_id
+            FROM profile_history GROUP BY username, date(recorded_at)
+        ), closes AS (
+            SELECT d.username, d.day, d.samples,
+                   l.followers_count AS followers, l.following_count AS following, l.posts_count AS posts,
+                   COALESCE(LAG(l.followers_count) OVER w, f.followers_count) AS open_followers,
+                   COALESCE(LAG(l.following_count) OVER w, f.following_count) AS open_following,
+                   COALESCE(LAG(l.posts_count) OVER w, f.posts_count) AS open_posts
+            FROM days AS d
+            JOIN profile_history AS l ON l.id = d.last_id
+            JOIN profile_history AS f ON f.id = d.first_id
+            WINDOW w AS (PARTITION BY d.username ORDER BY d.day)
+        )
+        SELECT username, day, followers, following, posts,
+               followers - open_followers, following - open_following, posts - open_posts, samples
+        FROM closes
+    ''')
+
+
+# Schema migrations (SQL tuples or callables) in order; only ever append
+MIGRATIONS = [
+    # 1: covering indexes for incremental syncs, the job queue and history
+    (
+        "CREATE INDEX IF NOT EXISTS idx_followers_profile_follower ON followers(profile_username, follower_id)",
+        "CREATE INDEX IF NOT EXISTS idx_following_profile_followee ON following(profile_username, followee_id)",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, attempts, id)",
+        "CREATE INDEX IF NOT EXISTS idx_followers_profile_time ON followers(profile_username, recorded_at)",
+        "CREATE INDEX IF NOT EXISTS idx_following_profile_time ON following(profile_username, recorded_at)",
+        """CREATE INDEX IF NOT EXISTS idx_profile_history_user_time
+           ON profile_history(username, recorded_at, followers_count, following_count, posts_count)""",
+        "CREATE INDEX IF NOT EXISTS idx_analytics_user_time ON analytics_cache(username, recorded_at)"
+    ),
+    # 2: follower/following snapshots stored as edge intervals
+    create_snapshot_tables,
+    # 3: covering churn indexes keyed on (snapshot, user_id)
+    (
+        "DROP INDEX IF EXISTS idx_follower_edges_added",
+        "DROP INDEX IF EXISTS idx_follower_edges_removed",
+        """CREATE INDEX idx_follower_edges_added
+           ON follower_edges(profile_username, edge, added_snapshot, user_id, removed_snapshot)""",
+        """CREATE INDEX idx_follower_edges_removed
+           ON follower_edges(profile_username, edge, removed_snapshot, user_id, added_snapshot)
+           WHERE removed_snapshot IS NOT NULL"""
+    ),
+    # 4: daily rollups of profile counts
+    create_daily_rollups,
+    # 5: the last snapshot that saw each open edge
+    ("ALTER TABLE follower_edges ADD COLUMN seen_snapshot INTEGER REFERENCES follower_snapshots(id)",),
+    # 6: first and last sample time of each day, kept when history is compacted
+    (
+        "ALTER TABLE profile_daily ADD COLUMN first_recorded TIMESTAMP",
+        "ALTER TABLE profile_daily ADD COLUMN last_recorded TIMESTAMP",
+        """UPDATE profile_daily SET (first_recorded, last_recorded) = (
+               SELECT MIN(recorded_at), MAX(recorded_at) FROM profile_history
+               WHERE username = profile_daily.username
+                 AND recorded_at >= profile_daily.day AND recorded_at < date(profile_daily.day, '+1 day')
+           )"""
+    ),
+]
+
+_connections = threading.local()
+_initialized = set()
+_init_lock = threading.Lock()
+
+
+def database_path(db_name):
+    """Absolute path used to key connections to a database file"""
+    return db_name if db_name == ":memory:" else os.path.abspath(db_name)
+
+
+def get_connection(db_name):
+    """Long-lived connection to db_name owned by the calling thread"""
+    pool = getattr(_connections, "pool", None)
+    if pool is None:
+        pool = _connections.pool = {}
+    path = database_path(db_name)
+    conn = pool.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path, timeout=30, cached_statements=STATEMENT_CACHE_SIZE)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        pool[path] = conn
+    return conn
+
+
+def release_connection(conn):
+    """Roll back whatever a failed operation left uncommitted"""
+    if conn.in_transaction:
+        conn.rollback()
+
+
+class EdgeSnapshot:
+    """One follower or following snapshot of a profile, written while crawling"""
+    
+    def __init__(self, db, profile_username, edge, recorded_at=None):
+        if edge not in EDGE_TYPES:
+            raise ValueError(f"Unknown edge type: {edge}")
+        self.db = db
+        self.profile_username = profile_username
+        self.edge = edge
+        self.recorded_at = recorded_at or datetime.now()
+        self.staged = 0
+        self.seconds = 0.0
+        conn = db.connect()
+        try:
+            # Stays partial (complete = 0) unless finish() runs
+            self.id = conn.execute('''
+                INSERT INTO follower_snapshots (profile_username, edge, recorded_at, complete)
+                VALUES (?, ?, ?, 0)
+            ''', (profile_username, edge, self.recorded_at.isoformat(" "))).lastrowid
+            conn.commit()
+        finally:
+            release_connection(conn)
+    
+    def add(self, records, chunk_size=WRITE_CHUNK_SIZE):
+        """Write follower records (any collection accepted by iter_rows)"""
+        rows = ((self.profile_username, self.edge, user_id, username, full_name, self.id, self.id)
+                for username, user_id, full_name in iter_rows(records) if user_id is not None)
+        sql = '''
+            INSERT INTO follower_edges
+            (profile_username, edge, user_id, username, full_name, added_snapshot, seen_snapshot)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (profile_username, edge, user_id) WHERE removed_snapshot IS NULL DO UPDATE SET
+                username = excluded.username, full_name = excluded.full_name,
+                seen_snapshot = excluded.seen_snapshot
+        '''
+        conn = self.db.connect()
+        start = time.perf_counter()
+        try:
+            while True:
+                chunk = list(itertools.islice(rows, chunk_size))
+                if not chunk:
+                    break
+                conn.executemany(sql, chunk)
+                conn.commit()
+                self.staged += len(chunk)
+        finally:
+            release_connection(conn)
+            self.seconds += time.perf_counter() - start
+    
+    def finish(self, complete=True):
+        """Close unseen edges of a complete snapshot, return the snapshot stats"""
+        scope = (self.profile_username, self.edge)
+        conn = self.db.connect()
+        start = time.perf_counter()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            removed = 0
+            if complete:
+                removed = conn.execute('''
+                    UPDATE follower_edges SET removed_snapshot = ?
+                    WHERE profile_username = ? AND edge = ? AND removed_snapshot IS NULL
+                      AND seen_snapshot IS NOT ?
+                ''', (self.id, *scope, self.id)).rowcount
+            added = conn.execute('''
+                SELECT COUNT(*) FROM follower_edges
+                WHERE profile_username = ? AND edge = ? AND added_snapshot = ?
+            ''', (*scope, self.id)).fetchone()[0]
+            edges = conn.execute('''
+                SELECT COUNT(*) FROM follower_edges
+                WHERE profile_username = ? AND edge = ? AND removed_snapshot IS NULL
+            ''', scope).fetchone()[0]
+            conn.execute('''
+                UPDATE follower_snapshots SET complete = ?, edge_count = ?, added_count = ?, removed_count = ?
+                WHERE id = ?
+            ''', (bool(complete), edges, added, removed, self.id))
+            conn.commit()
+            return {"snapshot": self.id, "edges": edges, "added": added, "removed": removed}
+        finally:
+            release_connection(conn)
+            self.seconds += time.perf_counter() - start
+
 
 class OsintDatabase:
     """SQLite database for storing OSINT data"""
     
     def __init__(self, db_name="osint_data.db"):
         self.db_name = db_name
-        self.init_database()
+        self.last_write_stats = None
+        self.last_compact_stats = None
+        # Schema setup runs once per database file and process
+        with _init_lock:
+            path = database_path(db_name)
+            if path not in _initialized or not os.path.exists(path):
+                self.init_database()
+                _initialized.add(path)
+    
+    def connect(self):
+        """This thread's pooled connection"""
+        return get_connection(self.db_name)
     
     def init_database(self):
         """Initialize database with required tables"""
-        conn = sqlite3.connect(self.db_name)
+        conn = self.connect()
         cursor = conn.cursor()
         
         # Profiles table
@@ -50,6 +346,19 @@ class OsintDatabase:
             )
         ''')
         
+        # Following table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS following (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                profile_username TEXT,
+                followee_username TEXT,
+                followee_id INTEGER,
+                followee_full_name TEXT,
+                recorded_at TIMESTAMP,
+                FOREIGN KEY(profile_username) REFERENCES profiles(username)
+            )
+        ''')
+        
         # Historical data table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS profile_history (
@@ -77,12 +386,119 @@ class OsintDatabase:
             )
         ''')
         
+        # Job queue for worker mode
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                target TEXT NOT NULL,
+                options TEXT,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER DEFAULT 0,
+                worker TEXT,
+                error TEXT,
+                created_at TIMESTAMP,
+                started_at TIMESTAMP,
+                finished_at TIMESTAMP
+            )
+        ''')
+        
         conn.commit()
-        conn.close()
+        self.migrate(conn)
     
-    def save_profile(self, profile):
+    def migrate(self, conn):
+        """Apply pending MIGRATIONS, one write transaction each"""
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                if version >= len(MIGRATIONS):
+                    conn.rollback()
+                    return version
+                step = MIGRATIONS[version]
+                if callable(step):
+                    step(conn)
+                else:
+                    for statement in step:
+                        conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {version + 1}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+    
+    def schema_version(self):
+        """Number of migrations applied to this database"""
+        return self.connect().execute("PRAGMA user_version").fetchone()[0]
+    
+    def maintain(self, action, **options):
+        """Run 'analyze', 'optimize' or 'compact' and return the elapsed seconds"""
+        conn = self.connect()
+        start = time.perf_counter()
+        if action == 'analyze':
+            conn.execute("ANALYZE")
+        elif action == 'optimize':
+            conn.execute("PRAGMA optimize")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        elif action == 'compact':
+            self.last_compact_stats = self.compact(**options)
+        else:
+            raise ValueError(f"Unknown maintenance action: {action}")
+        conn.commit()
+        return time.perf_counter() - start
+    
+    def compact(self, detail_days=HISTORY_DETAIL_DAYS, daily_days=HISTORY_DAILY_DAYS, now=None):
+        """Downsample old history, drop superseded analytics and reclaim space"""
+        now = now or datetime.now()
+        detail_cutoff = (now - timedelta(days=detail_days)).isoformat(" ")
+        daily_cutoff = (now - timedelta(days=max(daily_days, detail_days))).isoformat(" ")
+        conn = self.connect()
+        
+        def database_bytes():
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            return conn.execute("PRAGMA page_count").fetchone()[0] * page_size
+        
+        try:
+            size_before = database_bytes()
+            conn.execute("BEGIN IMMEDIATE")
+            # MAX(id) is the last row recorded in each bucket
+            downsampled = 0
+            for bucket, newer_than, older_than in (
+                    ("date(recorded_at)", daily_cutoff, detail_cutoff),
+                    ("date(recorded_at, 'weekday 0', '-6 days')", "", daily_cutoff)):
+                downsampled += conn.execute(f'''
+                    DELETE FROM profile_history
+                    WHERE recorded_at >= ?1 AND recorded_at < ?2 AND id NOT IN (
+                        SELECT MAX(id) FROM profile_history
+                        WHERE recorded_at >= ?1 AND recorded_at < ?2
+                        GROUP BY username, {bucket}
+                    )
+                ''', (newer_than, older_than)).rowcount
+            analytics = conn.execute('''
+                DELETE FROM analytics_cache
+                WHERE id NOT IN (SELECT MAX(id) FROM analytics_cache GROUP BY username)
+            ''').rowcount
+            conn.commit()
+            
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                # sqlite3 frees one page per step, executescript runs it to the end
+                conn.executescript("PRAGMA incremental_vacuum;")
+            else:
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.execute("VACUUM")
+            conn.execute("PRAGMA optimize")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            return {
+                "history_rows": downsampled,
+                "analytics_rows": analytics,
+                "bytes_reclaimed": max(size_before - database_bytes(), 0)
+            }
+        finally:
+            release_connection(conn)
+    
+    def save_profile(self, profile, recorded_at=None):
         """Save profile data to database"""
-        conn = sqlite3.connect(self.db_name)
+        recorded_at = recorded_at or datetime.now()
+        conn = self.connect()
         cursor = conn.cursor()
         
         try:
@@ -104,7 +520,7 @@ class OsintDatabase:
                 profile.followees,
                 profile.mediacount,
                 profile.profile_pic_url,
-                datetime.now()
+                recorded_at
             ))
             
             # Also record in history
@@ -117,7 +533,39 @@ class OsintDatabase:
                 profile.followers,
                 profile.followees,
                 profile.mediacount,
-                datetime.now()
+                recorded_at
+            ))
+            
+            # The delta keeps its reference (counts - delta) as the day is updated
+            cursor.execute('''
+                INSERT INTO profile_daily AS d
+                (username, day, followers, following, posts, followers_delta, following_delta, posts_delta, samples,
+                 first_recorded, last_recorded)
+                SELECT ?1, ?2, ?3, ?4, ?5,
+                       ?3 - COALESCE(prev.followers, ?3), ?4 - COALESCE(prev.following, ?4),
+                       ?5 - COALESCE(prev.posts, ?5), 1, ?6, ?6
+                FROM (SELECT 1) LEFT JOIN (
+                    SELECT followers, following, posts FROM profile_daily
+                    WHERE username = ?1 AND day < ?2 ORDER BY day DESC LIMIT 1
+                ) AS prev ON 1
+                WHERE true
+                ON CONFLICT (username, day) DO UPDATE SET
+                    followers = excluded.followers,
+                    following = excluded.following,
+                    posts = excluded.posts,
+                    followers_delta = excluded.followers - (d.followers - d.followers_delta),
+                    following_delta = excluded.following - (d.following - d.following_delta),
+                    posts_delta = excluded.posts - (d.posts - d.posts_delta),
+                    samples = d.samples + 1,
+                    first_recorded = MIN(COALESCE(d.first_recorded, excluded.first_recorded), excluded.first_recorded),
+                    last_recorded = MAX(COALESCE(d.last_recorded, excluded.last_recorded), excluded.last_recorded)
+            ''', (
+                profile.username,
+                recorded_at.date().isoformat(),
+                profile.followers,
+                profile.followees,
+                profile.mediacount,
+                recorded_at
             ))
             
             conn.commit()
@@ -126,38 +574,210 @@ class OsintDatabase:
             print(f"Error saving profile: {e}")
             return False
         finally:
-            conn.close()
+            release_connection(conn)
+    
+    def snapshot(self, profile_username, edge, recorded_at=None):
+        """Start an EdgeSnapshot for chunk-by-chunk writes on this thread"""
+        return EdgeSnapshot(self, profile_username, edge, recorded_at)
     
-    def save_followers(self, profile_username, followers_list):
-        """Save followers to database"""
-        conn = sqlite3.connect(self.db_name)
+    def save_followers(self, profile_username, followers_list, recorded_at=None, complete=True):
+        """Save followers as a snapshot (complete=False for partial lists)"""
+        return self.save_edges(profile_username, "followers", followers_list, recorded_at, complete)
+    
+    def save_following(self, profile_username, following_list, recorded_at=None, complete=True):
+        """Save following as a snapshot, see save_followers"""
+        return self.save_edges(profile_username, "following", following_list, recorded_at, complete)
+    
+    def save_edges(self, profile_username, edge, records, recorded_at=None, complete=True):
+        """Write one follower/following snapshot, stats go to last_write_stats"""
+        self.last_write_stats = None
+        snapshot = self.snapshot(profile_username, edge, recorded_at)
+        try:
+            snapshot.add(records)
+            stats = snapshot.finish(complete)
+        except Exception as e:
+            print(f"Error saving {edge}: {e}")
+            return False
+        self.last_write_stats = {
+            **stats,
+            "rows": snapshot.staged,
+            "seconds": round(snapshot.seconds, 3),
+            "rows_per_s": round(snapshot.staged / snapshot.seconds) if snapshot.seconds > 0 else 0
+        }
+        return True
+    
+    def list_snapshots(self, profile_username, edge="followers"):
+        """Snapshots of a profile's followers or following, oldest first"""
+        conn = self.connect()
         cursor = conn.cursor()
         
         try:
-            for follower in followers_list:
+            cursor.execute('''
+                SELECT id, recorded_at, complete, edge_count, added_count, removed_count
+                FROM follower_snapshots WHERE profile_username = ? AND edge = ? ORDER BY id
+            ''', (profile_username, edge))
+            return [
+                {
+                    "id": r[0],
+                    "recorded_at": r[1],
+                    "complete": bool(r[2]),
+                    "edges": r[3],
+                    "added": r[4],
+                    "removed": r[5]
+                }
+                for r in cursor.fetchall()
+            ]
+        finally:
+            release_connection(conn)
+    
+    def get_snapshot_edges(self, profile_username, edge="followers", snapshot_id=None):
+        """Rebuild the followers/following of a snapshot (latest by default)"""
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        try:
+            if snapshot_id is None:
                 cursor.execute('''
-                    INSERT INTO followers 
-                    (profile_username, follower_username, follower_id, follower_full_name, recorded_at)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    profile_username,
-                    follower.get("username"),
-                    follower.get("user_id"),
-                    follower.get("full_name"),
-                    datetime.now()
-                ))
-            
-            conn.commit()
-            return True
-        except Exception as e:
-            print(f"Error saving followers: {e}")
-            return False
+                    SELECT username, user_id, full_name FROM follower_edges
+                    WHERE profile_username = ? AND edge = ? AND removed_snapshot IS NULL
+                    ORDER BY added_snapshot
+                ''', (profile_username, edge))
+            else:
+                cursor.execute('''
+                    SELECT username, user_id, full_name FROM follower_edges
+                    WHERE profile_username = ? AND edge = ? AND added_snapshot <= ?
+                      AND (removed_snapshot IS NULL OR removed_snapshot > ?)
+                    ORDER BY added_snapshot
+                ''', (profile_username, edge, snapshot_id, snapshot_id))
+            return FollowerList(cursor)
+        finally:
+            release_connection(conn)
+    
+    def find_snapshot(self, profile_username, edge, at):
+        """Id of the last snapshot recorded at or before `at` (datetime), or 0"""
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute('''
+                SELECT id FROM follower_snapshots
+                WHERE profile_username = ? AND edge = ? AND recorded_at <= ?
+                ORDER BY id DESC LIMIT 1
+            ''', (profile_username, edge, at.isoformat(" ")))
+            row = cursor.fetchone()
+            return row[0] if row else 0
+        finally:
+            release_connection(conn)
+    
+    def churn_range(self, profile_username, edge="followers", since=None, until=None):
+        """Resolve the (from, to) snapshot ids to compare, or None"""
+        snapshots = [s["id"] for s in self.list_snapshots(profile_username, edge)]
+        if not snapshots:
+            return None
+        
+        if until is None:
+            to_snapshot = snapshots[-1]
+        elif isinstance(until, datetime):
+            to_snapshot = self.find_snapshot(profile_username, edge, until)
+        else:
+            to_snapshot = until
+        
+        if since is None:
+            earlier = [snapshot_id for snapshot_id in snapshots if snapshot_id < to_snapshot]
+            from_snapshot = earlier[-1] if earlier else 0
+        elif isinstance(since, datetime):
+            from_snapshot = self.find_snapshot(profile_username, edge, since)
+        else:
+            from_snapshot = since
+        return from_snapshot, to_snapshot
+    
+    def churn_query(self, kind, columns, keyset=False):
+        """SQL selecting gained or lost edges between two snapshots"""
+        if kind not in ("gained", "lost"):
+            raise ValueError(f"Unknown churn kind: {kind}")
+        snapshot_column = "added_snapshot" if kind == "gained" else "removed_snapshot"
+        # The cursor goes first so SQLite seeks to it
+        cursor_term = f"({snapshot_column}, user_id) > (?5, ?6) AND " if keyset else ""
+        if kind == "gained":
+            return f'''
+                SELECT {columns} FROM follower_edges
+                WHERE profile_username = ?1 AND edge = ?2 AND {cursor_term}added_snapshot > ?3
+                  AND added_snapshot <= ?4 AND (removed_snapshot IS NULL OR removed_snapshot > ?4)
+            '''
+        return f'''
+            SELECT {columns} FROM follower_edges
+            WHERE profile_username = ?1 AND edge = ?2 AND {cursor_term}removed_snapshot > ?3
+              AND removed_snapshot <= ?4 AND added_snapshot <= ?3
+        '''
+    
+    def get_churn_counts(self, profile_username, edge, from_snapshot, to_snapshot):
+        """Number of gained and lost edges between two snapshots"""
+        conn = self.connect()
+        cursor = conn.cursor()
+        params = (profile_username, edge, from_snapshot, to_snapshot)
+        
+        try:
+            return {
+                kind: cursor.execute(self.churn_query(kind, "COUNT(*)"), params).fetchone()[0]
+                for kind in ("gained", "lost")
+            }
         finally:
-            conn.close()
+            release_connection(conn)
+    
+    def get_churn_page(self, profile_username, edge, kind, from_snapshot, to_snapshot, after=None,
+                       page_size=CHURN_PAGE_SIZE):
+        """One page of gained or lost edges and the cursor of the next page"""
+        snapshot_column = "added_snapshot" if kind == "gained" else "removed_snapshot"
+        sql = self.churn_query(kind, f"username, user_id, full_name, {snapshot_column}", keyset=bool(after))
+        params = [profile_username, edge, from_snapshot, to_snapshot]
+        if after:
+            params.extend(after)
+        sql += f" ORDER BY {snapshot_column}, user_id LIMIT {int(page_size)}"
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        try:
+            rows = cursor.execute(sql, params).fetchall()
+        finally:
+            release_connection(conn)
+        
+        page = FollowerList(row[:3] for row in rows)
+        next_cursor = (rows[-1][3], rows[-1][1]) if len(rows) == page_size else None
+        return page, next_cursor
+    
+    def iter_churn(self, profile_username, edge, kind, from_snapshot, to_snapshot, page_size=CHURN_PAGE_SIZE):
+        """Yield all gained or lost edges page by page (FollowerList pages)"""
+        after = None
+        while True:
+            page, after = self.get_churn_page(profile_username, edge, kind, from_snapshot, to_snapshot,
+                                              after, page_size)
+            if len(page):
+                yield page
+            if after is None:
+                return
+    
+    def filter_known_edges(self, profile_username, edge, user_ids):
+        """Return the subset of user_ids currently recorded as followers/following"""
+        if not user_ids:
+            return set()
+        
+        placeholders = ",".join("?" * len(user_ids))
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(f'''
+                SELECT user_id FROM follower_edges
+                WHERE profile_username = ? AND edge = ? AND removed_snapshot IS NULL
+                  AND user_id IN ({placeholders})
+            ''', (profile_username, edge, *user_ids))
+            return {row[0] for row in cursor.fetchall()}
+        finally:
+            release_connection(conn)
     
     def save_analytics(self, username, analytics_data):
         """Save analytics results"""
-        conn = sqlite3.connect(self.db_name)
+        conn = self.connect()
         cursor = conn.cursor()
         
         try:
@@ -180,11 +800,11 @@ class OsintDatabase:
             print(f"Error saving analytics: {e}")
             return False
         finally:
-            conn.close()
+            release_connection(conn)
     
     def get_profile_history(self, username):
         """Get historical data for a profile"""
-        conn = sqlite3.connect(self.db_name)
+        conn = self.connect()
         cursor = conn.cursor()
         
         try:
@@ -206,34 +826,234 @@ class OsintDatabase:
                 for r in results
             ]
         finally:
-            conn.close()
+            release_connection(conn)
     
     def get_growth_stats(self, username):
         """Calculate growth stats from history"""
-        history = self.get_profile_history(username)
+        overview = self.get_growth_overview([username])
         
-        if len(history) < 2:
+        if not overview or overview[0]["data_points"] < 2:
             return None
+        return overview[0]
+    
+    def get_growth_overview(self, usernames=None, limit=None, offset=0):
+        """Latest counts and growth of many profiles in one query"""
+        if usernames is None:
+            profiles = "SELECT username FROM profiles"
+            params = []
+        else:
+            # Given names are looked up even without a profiles row
+            profiles = "SELECT DISTINCT value AS username FROM json_each(?)"
+            params = [json.dumps(list(usernames))]
+        params += [-1 if limit is None else limit, offset]
+        conn = self.connect()
+        cursor = conn.cursor()
         
-        first = history[0]
-        last = history[-1]
+        try:
+            # The daily deltas add up to the change since the first data point
+            cursor.execute(f'''
+                WITH page AS (
+                    {profiles} ORDER BY username LIMIT ? OFFSET ?
+                ), spans AS (
+                    SELECT p.username, COALESCE(SUM(d.samples), 0) AS data_points,
+                           MIN(d.first_recorded) AS first_recorded, MAX(d.last_recorded) AS last_recorded,
+                           MAX(d.day) AS last_day,
+                           COALESCE(SUM(d.followers_delta), 0) AS followers_change,
+                           COALESCE(SUM(d.following_delta), 0) AS following_change,
+                           COALESCE(SUM(d.posts_delta), 0) AS posts_change
+                    FROM page AS p LEFT JOIN profile_daily AS d ON d.username = p.username
+                    GROUP BY p.username
+                )
+                SELECT s.username, s.data_points, s.first_recorded, s.last_recorded, l.followers, l.following, l.posts,
+                       s.followers_change, s.following_change, s.posts_change
+                FROM spans AS s LEFT JOIN profile_daily AS l ON l.username = s.username AND l.day = s.last_day
+                ORDER BY s.username
+            ''', params)
+            
+            return [
+                {
+                    "username": r[0],
+                    "data_points": r[1],
+                    "first_recorded": r[2],
+                    "last_recorded": r[3],
+                    "followers": r[4],
+                    "following": r[5],
+                    "posts": r[6],
+                    "followers_change": r[7],
+                    "following_change": r[8],
+                    "posts_change": r[9]
+                }
+                for r in cursor.fetchall()
+            ]
+        finally:
+            release_connection(conn)
+    
+    def get_metric_series(self, usernames, metric="followers", start=None, end=None, period="day"):
+        """Aligned daily or weekly series of a metric for many profiles"""
+        if metric not in SERIES_METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        if period not in ("day", "week"):
+            raise ValueError(f"Unknown period: {period}")
+        usernames = list(dict.fromkeys(usernames))
+        bucket = "day" if period == "day" else "date(day, 'weekday 0', '-6 days')"
+        conn = self.connect()
+        cursor = conn.cursor()
         
-        return {
-            "followers_change": last["followers"] - first["followers"],
-            "following_change": last["following"] - first["following"],
-            "posts_change": last["posts"] - first["posts"],
-            "data_points": len(history),
-            "first_recorded": first["recorded_at"],
-            "last_recorded": last["recorded_at"]
-        }
+        try:
+            # The bare count column comes from the row of MAX(day)
+            cursor.execute(f'''
+                SELECT username, {bucket} AS period, {metric}, SUM({metric}_delta), MAX(day)
+                FROM profile_daily
+                WHERE username IN (SELECT value FROM json_each(?)) AND day >= ? AND day <= ?
+                GROUP BY username, period
+            ''', (json.dumps(usernames), start.strftime('%Y-%m-%d') if start else "",
+                  end.strftime('%Y-%m-%d') if end else "9999-12-31"))
+            rows = cursor.fetchall()
+        finally:
+            release_connection(conn)
+        
+        periods = []
+        if rows:
+            first = date.fromisoformat(min(row[1] for row in rows))
+            last = date.fromisoformat(max(row[1] for row in rows))
+            if start:
+                first = date.fromisoformat(start.strftime('%Y-%m-%d'))
+                if period == "week":
+                    first -= timedelta(days=first.weekday())
+            if end:
+                last = date.fromisoformat(end.strftime('%Y-%m-%d'))
+            step = timedelta(days=1 if period == "day" else 7)
+            while first <= last:
+                periods.append(first.isoformat())
+                first += step
+        
+        index = {label: position for position, label in enumerate(periods)}
+        values = {username: [None] * len(periods) for username in usernames}
+        changes = {username: [0] * len(periods) for username in usernames}
+        for username, label, value, change, _ in rows:
+            values[username][index[label]] = value
+            changes[username][index[label]] = change
+        return {"periods": periods, "values": values, "changes": changes}
+    
+    def count_profiles(self):
+        """Number of stored profiles"""
+        conn = self.connect()
+        
+        try:
+            return conn.execute('SELECT COUNT(*) FROM profiles').fetchone()[0]
+        finally:
+            release_connection(conn)
     
     def get_all_profiles(self):
         """Get all stored profiles"""
-        conn = sqlite3.connect(self.db_name)
+        conn = self.connect()
         cursor = conn.cursor()
         
         try:
             cursor.execute('SELECT username FROM profiles')
             return [row[0] for row in cursor.fetchall()]
         finally:
-            conn.close()
+            release_connection(conn)
+    
+    def get_target_stats(self, usernames, chunk_size=500):
+        """Last update and stored counts of the given profiles"""
+        usernames = list(usernames)
+        conn = self.connect()
+        cursor = conn.cursor()
+        stats = {}
+        
+        try:
+            for start in range(0, len(usernames), chunk_size):
+                chunk = usernames[start:start + chunk_size]
+                placeholders = ",".join("?" * len(chunk))
+                cursor.execute(f'''
+                    SELECT username, last_updated, followers, following, posts
+                    FROM profiles WHERE username IN ({placeholders})
+                ''', chunk)
+                for username, last_updated, followers, following, posts in cursor.fetchall():
+                    stats[username] = {
+                        "last_updated": datetime.fromisoformat(last_updated) if last_updated else None,
+                        "followers": followers or 0,
+                        "following": following or 0,
+                        "posts": posts or 0
+                    }
+            return stats
+        finally:
+            release_connection(conn)
+    
+    def enqueue_jobs(self, targets, options=None):
+        """Add pending jobs for targets not already queued, return the count"""
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("SELECT target FROM jobs WHERE status IN ('pending', 'running')")
+            queued = {row[0] for row in cursor.fetchall()}
+            encoded = json.dumps(options or {})
+            now = datetime.now()
+            new_jobs = []
+            for target in targets:
+                if target not in queued:
+                    queued.add(target)
+                    new_jobs.append((target, encoded, now))
+            cursor.executemany(
+                "INSERT INTO jobs (target, options, status, created_at) VALUES (?, ?, 'pending', ?)", new_jobs)
+            conn.commit()
+            return len(new_jobs)
+        finally:
+            release_connection(conn)
+    
+    def claim_job(self, worker):
+        """Atomically mark the oldest pending job as running and return it"""
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute('''
+                UPDATE jobs SET status = 'running', worker = ?, started_at = ?, attempts = attempts + 1
+                WHERE id = (SELECT id FROM jobs WHERE status = 'pending' ORDER BY attempts, id LIMIT 1)
+                RETURNING id, target, options, attempts
+            ''', (worker, datetime.now()))
+            row = cursor.fetchone()
+            conn.commit()
+            if not row:
+                return None
+            return {"id": row[0], "target": row[1], "options": json.loads(row[2] or "{}"), "attempts": row[3]}
+        finally:
+            release_connection(conn)
+    
+    def finish_job(self, job_id, status, error=None):
+        """Set a claimed job to done, failed, or back to pending for a retry"""
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(
+                'UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?',
+                (status, error, datetime.now() if status != 'pending' else None, job_id))
+            conn.commit()
+        finally:
+            release_connection(conn)
+    
+    def requeue_stale_jobs(self, worker):
+        """Put jobs a previous run of `worker` left running back to pending"""
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("UPDATE jobs SET status = 'pending' WHERE status = 'running' AND worker = ?", (worker,))
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            release_connection(conn)
+    
+    def get_job_counts(self):
+        """Number of jobs per status"""
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status')
+            return dict(cursor.fetchall())
+        finally:
+            release_connection(conn)
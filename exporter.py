@@ -4,48 +4,43 @@ import json
 import csv
 from datetime import datetime
 from utils import Gr, Re, Wh, Ye
+from records import FIELDS, FollowerRecord, iter_rows
 
 class Exporter:
     """Handle exports in multiple formats"""
     
     @staticmethod
-    def export_json(profile, followers_list, followees_list, username, analytics=None):
-        """Export to JSON format"""
-        data = {
-            "export_date": datetime.now().isoformat(),
-            "profile": {
-                "username": profile.username,
-                "full_name": profile.full_name,
-                "user_id": profile.userid,
-                "biography": profile.biography,
-                "external_url": profile.external_url,
-                "is_private": profile.is_private,
-                "is_business_account": profile.is_business_account,
-                "business_category": profile.business_category_name,
-                "followers_count": profile.followers,
-                "following_count": profile.followees,
-                "posts_count": profile.mediacount,
-                "profile_pic_url": profile.profile_pic_url
-            },
-            "followers": followers_list,
-            "following": followees_list
+    def profile_data(profile):
+        """Profile metadata as exported in JSON"""
+        return {
+            "username": profile.username,
+            "full_name": profile.full_name,
+            "user_id": profile.userid,
+            "biography": profile.biography,
+            "external_url": profile.external_url,
+            "is_private": profile.is_private,
+            "is_business_account": profile.is_business_account,
+            "business_category": profile.business_category_name,
+            "followers_count": profile.followers,
+            "following_count": profile.followees,
+            "posts_count": profile.mediacount,
+            "profile_pic_url": profile.profile_pic_url
         }
-        
-        if analytics:
-            data["analytics"] = analytics
-        
-        filename = f"{username}_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        
-        return filename
     
     @staticmethod
-    def export_csv(profile, followers_list, followees_list, username):
-        """Export to CSV format"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    def export_json(profile, followers_list, followees_list, username, analytics=None):
+        """Export to JSON format
         
-        # Profile CSV
+        Records are serialized one at a time, so a FollowerList is never
+        expanded into dicts all at once."""
+        exports = StreamingExport(profile, username, 'json')
+        exports.write("followers", followers_list)
+        exports.write("following", followees_list)
+        return exports.close(analytics)[0]
+    
+    @staticmethod
+    def write_profile_csv(profile, username, timestamp):
+        """Write the profile metadata CSV"""
         profile_file = f"{username}_profile_{timestamp}.csv"
         with open(profile_file, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
@@ -60,20 +55,29 @@ class Exporter:
             writer.writerow(['Followers', profile.followers])
             writer.writerow(['Following', profile.followees])
             writer.writerow(['Posts', profile.mediacount])
+        return profile_file
+    
+    @staticmethod
+    def export_csv(profile, followers_list, followees_list, username):
+        """Export to CSV format"""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        
+        # Profile CSV
+        profile_file = Exporter.write_profile_csv(profile, username, timestamp)
         
         # Followers CSV
         followers_file = f"{username}_followers_{timestamp}.csv"
         with open(followers_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=['username', 'user_id', 'full_name'])
-            writer.writeheader()
-            writer.writerows(followers_list)
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            writer.writerows(iter_rows(followers_list))
         
         # Following CSV
         following_file = f"{username}_following_{timestamp}.csv"
         with open(following_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=['username', 'user_id', 'full_name'])
-            writer.writeheader()
-            writer.writerows(followees_list)
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            writer.writerows(iter_rows(followees_list))
         
         return profile_file, followers_file, following_file
     
@@ -83,6 +87,14 @@ class Exporter:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f"{username}_report_{timestamp}.html"
         
+        return Exporter.write_html(filename, profile, username, analytics,
+                                   followers_list[:100], len(followers_list),
+                                   followees_list[:100], len(followees_list))
+    
+    @staticmethod
+    def write_html(filename, profile, username, analytics, followers_preview, followers_total,
+                   followees_preview, followees_total):
+        """Write the HTML report from the first rows and totals of each list"""
         html_content = f"""
         <!DOCTYPE html>
         <html>
@@ -168,7 +180,7 @@ class Exporter:
             """
         
         html_content += f"""
-                <h2>Followers ({len(followers_list)})</h2>
+                <h2>Followers ({followers_total})</h2>
                 <table>
                     <thead>
                         <tr>
@@ -180,7 +192,7 @@ class Exporter:
                     <tbody>
         """
         
-        for follower in followers_list[:100]:  # Limit to first 100 for performance
+        for follower in followers_preview[:100]:  # Limit to first 100 for performance
             html_content += f"""
                         <tr>
                             <td>{follower.get('username', 'N/A')}</td>
@@ -189,10 +201,10 @@ class Exporter:
                         </tr>
             """
         
-        if len(followers_list) > 100:
+        if followers_total > 100:
             html_content += f"""
                         <tr>
-                            <td colspan="3"><em>... and {len(followers_list) - 100} more followers</em></td>
+                            <td colspan="3"><em>... and {followers_total - 100} more followers</em></td>
                         </tr>
             """
         
@@ -200,7 +212,7 @@ class Exporter:
                     </tbody>
                 </table>
                 
-                <h2>Following ({len(followees_list)})</h2>
+                <h2>Following ({followees_total})</h2>
                 <table>
                     <thead>
                         <tr>
@@ -212,7 +224,7 @@ class Exporter:
                     <tbody>
         """
         
-        for followee in followees_list[:100]:
+        for followee in followees_preview[:100]:
             html_content += f"""
                         <tr>
                             <td>{followee.get('username', 'N/A')}</td>
@@ -221,10 +233,10 @@ class Exporter:
                         </tr>
             """
         
-        if len(followees_list) > 100:
+        if followees_total > 100:
             html_content += f"""
                         <tr>
-                            <td colspan="3"><em>... and {len(followees_list) - 100} more following</em></td>
+                            <td colspan="3"><em>... and {followees_total - 100} more following</em></td>
                         </tr>
             """
         
@@ -242,3 +254,90 @@ class Exporter:
             f.write(html_content)
         
         return filename
+
+
+class StreamingExport:
+    """Write exports incrementally as follower chunks arrive
+    
+    Followers must be streamed before following. Only the first 100 rows
+    of each list are kept in memory (for the HTML report)."""
+    
+    PREVIEW_ROWS = 100
+    
+    def __init__(self, profile, username, formats='json'):
+        self.profile = profile
+        self.username = username
+        self.formats = [f.strip().lower() for f in formats.split(',')]
+        self.timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.files = []
+        self.counts = {"followers": 0, "following": 0}
+        self.previews = {"followers": [], "following": []}
+        self.json_file = None
+        self.json_edge = None
+        self.csv_files = {}
+        self.csv_writers = {}
+        
+        if 'json' in self.formats:
+            filename = f"{username}_data_{self.timestamp}.json"
+            self.json_file = open(filename, 'w', encoding='utf-8')
+            self.files.append(filename)
+            header = {"export_date": datetime.now().isoformat(), "profile": Exporter.profile_data(profile)}
+            self.json_file.write(json.dumps(header, indent=2, ensure_ascii=False)[:-2])
+        
+        if 'csv' in self.formats:
+            self.files.append(Exporter.write_profile_csv(profile, username, self.timestamp))
+            for edge in ("followers", "following"):
+                filename = f"{username}_{edge}_{self.timestamp}.csv"
+                f = open(filename, 'w', newline='', encoding='utf-8')
+                writer = csv.writer(f)
+                writer.writerow(FIELDS)
+                self.csv_files[edge] = f
+                self.csv_writers[edge] = writer
+                self.files.append(filename)
+    
+    def _start_json_edge(self, edge):
+        """Close the previous JSON array and open the one for `edge`"""
+        if self.json_edge:
+            self.json_file.write("\n  ]" if self.counts[self.json_edge] else "]")
+        self.json_file.write(f',\n  "{edge}": [')
+        self.json_edge = edge
+    
+    def write(self, edge, chunk):
+        """Append a chunk of follower/following records"""
+        if self.json_file and self.json_edge != edge:
+            self._start_json_edge(edge)
+        
+        for row in iter_rows(chunk):
+            if self.json_file:
+                item = json.dumps(dict(zip(FIELDS, row)), indent=2, ensure_ascii=False).replace("\n", "\n    ")
+                self.json_file.write(("," if self.counts[edge] else "") + "\n    " + item)
+            if edge in self.csv_writers:
+                self.csv_writers[edge].writerow(row)
+            if len(self.previews[edge]) < self.PREVIEW_ROWS:
+                self.previews[edge].append(FollowerRecord(*row))
+            self.counts[edge] += 1
+    
+    def close(self, analytics=None):
+        """Finish all files and return the list of exported filenames"""
+        if self.json_file:
+            for edge in ("followers", "following"):
+                if self.json_edge != edge and self.counts[edge] == 0:
+                    self._start_json_edge(edge)
+            self.json_file.write("\n  ]" if self.counts[self.json_edge] else "]")
+            if analytics:
+                self.json_file.write(',\n  "analytics": ' +
+                                     json.dumps(analytics, indent=2, ensure_ascii=False).replace("\n", "\n  "))
+            self.json_file.write("\n}")
+            self.json_file.close()
+        
+        for f in self.csv_files.values():
+            f.close()
+        
+        if 'html' in self.formats:
+            filename = f"{self.username}_report_{self.timestamp}.html"
+            Exporter.write_html(filename, self.profile, self.username, analytics,
+                                self.previews["followers"], self.counts["followers"],
+                                self.previews["following"], self.counts["following"])
+            self.files.append(filename)
+        
+        return self.files
@@ -8,14 +8,26 @@ import sys
 import os
 import time
 import getpass
+from datetime import date, timedelta
 from cli import get_args, validate_args
-from processor import InstagramOSINT
-from utils import print_logo, print_info, print_warning, print_error, print_success, print_header, Wh, Gr, Ye, Cy
+from metrics import METRICS_DIR
+from utils import print_logo, print_info, print_warning, print_error, print_success, print_header, Wh, Gr, Ye, Cy, Re
 from menu import (display_main_menu, get_menu_choice, display_features_menu, 
                   get_features_config, display_export_menu, get_export_format,
                   get_target_input, get_multiple_targets, get_limit_options,
-                  confirm_action, display_summary)
-from database import OsintDatabase
+                  get_worker_count, confirm_action, display_summary)
+
+# Subsystems are imported where they are first used, so --help, argument
+# errors, --enqueue and the database viewer never load instaloader.
+
+def write_metrics(osint, directory=METRICS_DIR, quiet=False):
+    """Write the run's per-stage metrics files"""
+    try:
+        json_file, prom_file = osint.metrics.write(directory)
+        if not quiet:
+            print_success(f"Metrics written to {json_file} and {prom_file}")
+    except OSError as e:
+        print_warning(f"Could not write metrics: {str(e)}")
 
 def interactive_mode():
     """Interactive CLI mode with menu system"""
@@ -30,7 +42,9 @@ def interactive_mode():
     print_logo()
     
     # Initialize OSINT processor
-    osint = InstagramOSINT(username, password)
+    from processor import InstagramOSINT
+    from cache import ProfileCache
+    osint = InstagramOSINT(username, password, profile_cache=ProfileCache())
     
     # Authenticate
     print_info("Authenticating...")
@@ -50,6 +64,8 @@ def interactive_mode():
         choice = get_menu_choice("Select an option", ['1', '2', '3', '4', '5'])
         
         if choice == '5':
+            osint.print_cache_stats()
+            write_metrics(osint)
             print_success("Goodbye!")
             sys.exit(0)
         
@@ -71,6 +87,8 @@ def interactive_mode():
         
         # Ask if user wants to continue
         if not confirm_action("Continue with another operation?"):
+            osint.print_cache_stats()
+            write_metrics(osint)
             print_success("Goodbye!")
             sys.exit(0)
 
@@ -147,13 +165,17 @@ def handle_batch_profiles(osint):
     # Get limits
     follower_limit, following_limit = get_limit_options()
     
+    # Get concurrency
+    workers = get_worker_count()
+    
     # Build options
     options = {
         'analyze': features_config['analyze'],
         'db': features_config['db'],
         'no_download': features_config['no_download'],
         'limit_followers': follower_limit,
-        'limit_following': following_limit
+        'limit_following': following_limit,
+        'workers': workers
     }
     
     # Show summary
@@ -166,20 +188,17 @@ def handle_batch_profiles(osint):
     
     # Process batch
     print_header("BATCH PROCESSING")
+    done = []
     
-    for idx, target in enumerate(targets, 1):
-        print_info(f"Processing [{idx}/{len(targets)}]: {target}")
-        
-        results = osint.process_profile(target, options)
-        
+    def export_result(target, results):
+        done.append(target)
         if results:
-            exported = osint.export_results(results, target, export_format)
-            print_success(f"✓ Completed {target}")
+            osint.export_results(results, target, export_format)
+            print_success(f"✓ Completed [{len(done)}/{len(targets)}] {target}")
         else:
-            print_error(f"✗ Failed {target}")
-        
-        if idx < len(targets):
-            time.sleep(2)  # Rate limiting
+            print_error(f"✗ Failed [{len(done)}/{len(targets)}] {target}")
+    
+    osint.batch_process(targets, options, on_result=export_result)
     
     print_success(f"✓ Batch processing complete! Processed {len(targets)} profiles")
 
@@ -248,51 +267,172 @@ def handle_view_database():
     print_logo()
     print_header("DATABASE VIEWER")
     
+    from database import OsintDatabase
     db = OsintDatabase()
-    profiles = db.get_all_profiles()
+    total = db.count_profiles()
     
-    if not profiles:
+    if not total:
         print_warning("No profiles in database yet")
         return
     
-    print_info(f"Total profiles stored: {len(profiles)}")
+    print_info(f"Total profiles stored: {total}")
     print()
     
-    for profile in profiles[:10]:  # Show first 10
-        print(f"       {Wh}• {Gr}{profile}")
-        
-        # Try to get history
-        history = db.get_profile_history(profile)
-        if len(history) > 1:
-            growth = db.get_growth_stats(profile)
-            if growth:
-                print(f"         {Wh}├─ Data points: {Ye}{growth['data_points']}")
-                print(f"         {Wh}├─ Follower change: {Ye}{growth['followers_change']:+,}")
-                print(f"         {Wh}└─ Following change: {Ye}{growth['following_change']:+,}")
-    
-    if len(profiles) > 10:
-        print(f"\n       {Wh}... and {Ye}{len(profiles) - 10}{Wh} more profiles")
+    # Growth of the first 10 profiles, from the daily rollups
+    overview = db.get_growth_overview(limit=10)
+    week = db.get_metric_series([growth['username'] for growth in overview], 'followers',
+                                start=date.today() - timedelta(days=6), end=date.today())
+    for growth in overview:
+        print(f"       {Wh}• {Gr}{growth['username']}")
+        if growth['data_points'] > 1:
+            print(f"         {Wh}├─ Data points: {Ye}{growth['data_points']}")
+            print(f"         {Wh}├─ Follower change: {Ye}{growth['followers_change']:+,}")
+            print(f"         {Wh}├─ Followers, last 7 days: {Ye}{sum(week['changes'][growth['username']]):+,}")
+            print(f"         {Wh}└─ Following change: {Ye}{growth['following_change']:+,}")
+    
+    if total > 10:
+        print(f"\n       {Wh}... and {Ye}{total - 10}{Wh} more profiles")
     
     print()
 
 
+def run_maintenance(action, quiet=False, **options):
+    """Run a database maintenance action"""
+    from database import OsintDatabase
+    db = OsintDatabase()
+    elapsed = db.maintain(action, **options)
+    if not quiet:
+        print_success(f"Database {action} finished in {elapsed:.2f}s (schema version {db.schema_version()})")
+        stats = db.last_compact_stats
+        if stats:
+            print_info(f"Removed {stats['history_rows']:,} history and {stats['analytics_rows']:,} analytics rows, "
+                       f"reclaimed {stats['bytes_reclaimed'] / 1048576:.1f} MB")
+
+def run_churn(args):
+    """Print or write followers/following gained and lost by a target"""
+    import csv
+    from database import OsintDatabase
+    db = OsintDatabase()
+    target = args.churn.strip().lstrip('@')
+    edges = ('followers', 'following') if args.churn_edge == 'both' else (args.churn_edge,)
+    output = open(args.churn_output, 'w', newline='', encoding='utf-8') if args.churn_output else None
+    writer = csv.writer(output) if output else None
+    if writer:
+        writer.writerow(("edge", "change", "to_snapshot", "username", "user_id", "full_name"))
+    
+    try:
+        for edge in edges:
+            snapshots = db.churn_range(target, edge, args.since, args.until)
+            if not snapshots:
+                print_warning(f"No {edge} snapshots stored for {target}")
+                continue
+            from_snapshot, to_snapshot = snapshots
+            counts = db.get_churn_counts(target, edge, from_snapshot, to_snapshot)
+            if not args.quiet:
+                print_header(f"{edge.upper()} CHURN {target}")
+                print_info(f"Snapshot {from_snapshot} -> {to_snapshot}: "
+                           f"{counts['gained']:,} gained, {counts['lost']:,} lost")
+            
+            for kind, sign, color in (("gained", "+", Gr), ("lost", "-", Re)):
+                for page in db.iter_churn(target, edge, kind, from_snapshot, to_snapshot):
+                    if writer:
+                        writer.writerows((edge, kind, to_snapshot, *row) for row in page.rows())
+                    else:
+                        for username in page.usernames:
+                            print(f"       {color}{sign} {Wh}{username}")
+    finally:
+        if output:
+            output.close()
+    if output and not args.quiet:
+        print_success(f"Churn written to {args.churn_output}")
+
 def cli_mode(args):
     """Command-line argument mode"""
+    if args.maintain:
+        options = {'detail_days': args.keep_detail, 'daily_days': args.keep_daily} if args.maintain == 'compact' else {}
+        run_maintenance(args.maintain, args.quiet, **options)
+        return
+    
+    if args.churn:
+        run_churn(args)
+        return
+    
     # Prepare options
     options = {
         'analyze': args.analyze,
         'db': args.db,
+        'incremental': args.incremental,
         'no_download': args.no_download,
         'limit_followers': args.limit_followers,
-        'limit_following': args.limit_following
+        'limit_following': args.limit_following,
+        'workers': args.workers,
+        'rate_limit': 0 if args.rate_limit is None and args.adaptive_rate else args.rate_limit,
+        'parallel_stages': args.parallel_stages,
+        'stage_concurrency': args.stage_concurrency,
+        'stream': args.stream,
+        'chunk_size': args.chunk_size,
+        'export_formats': args.output
     }
     
+    # Get target list
+    targets = []
+    if args.target:
+        targets = [args.target]
+    elif args.file:
+        try:
+            with open(args.file, 'r') as f:
+                targets = [line.strip() for line in f if line.strip()]
+        except FileNotFoundError:
+            if not args.quiet:
+                print_error(f"File not found: {args.file}")
+            sys.exit(1)
+    
+    # Stalest data first, skipping recently updated targets
+    if args.schedule or args.fresh_within:
+        from scheduler import TargetScheduler
+        fresh_within = timedelta(hours=args.fresh_within) if args.fresh_within else None
+        scheduler = TargetScheduler(fresh_within=fresh_within)
+        total = len(targets)
+        targets = scheduler.schedule(targets, options)
+        if not args.quiet:
+            print_info(f"Scheduled {len(targets)}/{total} targets ({scheduler.duplicates} duplicate(s), "
+                       f"{len(scheduler.skipped_fresh)} fresh target(s) skipped)")
+    
+    if args.enqueue:
+        from database import OsintDatabase
+        from worker import job_options
+        queued = OsintDatabase().enqueue_jobs(targets, job_options(options))
+        if not args.quiet:
+            print_success(f"Queued {queued} job(s) ({len(targets) - queued} already queued)")
+        return
+    
+    if args.profile_run:
+        # cProfile only sees the thread it runs on, so keep all work on it
+        if not args.quiet and (options['workers'] > 1 or args.media_workers > 1 or args.parallel_stages):
+            print_warning("--profile-run processes targets, stages and downloads one at a time")
+        options['workers'] = 1
+        options['parallel_stages'] = False
+        args.media_workers = 1
+    
     # Initialize OSINT processor
+    from processor import InstagramOSINT
+    from cache import ProfileCache
+    from metrics import RunMetrics
+    osint_options = {
+        'checkpoint_pages': args.checkpoint_every,
+        'media_workers': args.media_workers,
+        'per_host': args.per_host,
+        'fast_update': args.fast_update,
+        'adaptive_rate': args.adaptive_rate,
+        'metrics': RunMetrics(),
+        'profile_cache': ProfileCache(ttl=args.cache_ttl, max_entries=args.cache_size, refresh=args.refresh)
+    }
     osint = InstagramOSINT(
         args.username,
         args.password,
         use_session=not args.no_session,
-        quiet=args.quiet
+        quiet=args.quiet,
+        **osint_options
     )
     
     # Authenticate
@@ -301,36 +441,63 @@ def cli_mode(args):
             print_error("Authentication failed!")
         sys.exit(1)
     
-    # Get target list
-    targets = []
-    if args.target:
-        targets = [args.target]
-    elif args.file:
-        try:
-            with open(args.file, 'r') as f:
-                targets = [line.strip() for line in f if line.strip()]
-        except FileNotFoundError:
-            if not args.quiet:
-                print_error(f"File not found: {args.file}")
-            sys.exit(1)
+    # Spread targets over several saved sessions if requested
+    runner = osint
+    if args.accounts:
+        from sessions import SessionPool
+        runner = SessionPool.from_saved_sessions(
+            [a.strip() for a in args.accounts.split(',') if a.strip()],
+            primary=osint,
+            quiet=args.quiet,
+            targets_per_minute=args.session_rate,
+            quarantine=args.quarantine,
+            osint_options=osint_options
+        )
+    
+    pipeline = runner.process if args.accounts else osint.run_pipeline
+    export = osint.export_results
+    profiler = None
+    if args.profile_run:
+        from profiling import RunProfiler
+        profiler = RunProfiler(args.profile_run)
+        pipeline = profiler.wrap(pipeline, label="pipeline")
+        export = lambda result, target, formats: profiler.run(target, osint.export_results, result, target,
+                                                             formats, label="export")
     
     # Process targets
-    if args.compare and len(targets) > 1:
+    if args.worker:
+        # Long-running mode, targets come from the job queue
+        from worker import QueueWorker
+        worker = QueueWorker(osint, options, runner=pipeline, export=export,
+                             poll_interval=args.poll_interval, max_attempts=args.max_attempts,
+                             quiet=args.quiet)
+        worker.run(exit_when_idle=args.exit_when_idle)
+    elif args.compare and len(targets) > 1:
         # Comparison mode
-        all_results = osint.batch_process(targets, options)
+        all_results = osint.batch_process(targets, options, runner=pipeline)
         
         if all_results:
             # Export each profile
             for result in all_results:
                 profile = result['profile']
-                osint.export_results(result, profile.username, args.output)
+                export(result, profile.username, args.output)
     else:
-        # Single or batch mode
-        for target in targets:
-            result = osint.process_profile(target, options)
+        # Single or batch mode, exporting each target as soon as it finishes
+        def export_result(target, result):
             if result:
-                osint.export_results(result, target, args.output)
-            time.sleep(2)  # Rate limiting
+                export(result, target, args.output)
+        
+        osint.batch_process(targets, options, on_result=export_result, runner=pipeline)
+    
+    if args.accounts:
+        runner.print_summary()
+    osint.print_cache_stats()
+    if not args.no_metrics:
+        write_metrics(osint, args.metrics_dir, args.quiet)
+    if profiler:
+        directory = profiler.write()
+        if not args.quiet:
+            print_success(f"Profiling reports written to {directory}")
 
 
 def main():
@@ -0,0 +1,220 @@
+"""Parallel media downloads for Instagram OSINT"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone
+from urllib.parse import urlparse
+
+DEFAULT_MEDIA_WORKERS = 4
+DEFAULT_PER_HOST = 2  # Concurrent downloads against one CDN host
+SYNC_STATE_FILE = ".sync_state.json"
+
+# Sizes of the media files written by the download running in this context
+WRITTEN_SIZES = contextvars.ContextVar("written_sizes", default=None)
+
+
+def track_writes(context):
+    """Report the size of each file context.write_raw saves to WRITTEN_SIZES"""
+    if getattr(context, "tracks_writes", False):
+        return
+    write_raw = context.write_raw
+
+    def tracked_write_raw(resp, filename):
+        write_raw(resp, filename)
+        sizes = WRITTEN_SIZES.get()
+        if sizes is not None:
+            try:
+                sizes.append(os.path.getsize(filename))
+            except OSError:
+                pass
+
+    context.write_raw = tracked_write_raw
+    context.tracks_writes = True
+
+
+def utc_timestamp(date_utc):
+    """POSIX timestamp of instaloader's naive UTC datetimes"""
+    return date_utc.replace(tzinfo=timezone.utc).timestamp()
+
+
+class SyncState:
+    """Newest downloaded post and highlight items of one target
+
+    Stored as downloads/{target}/.sync_state.json and used by fast-update
+    runs to stop at content that was already downloaded."""
+
+    # Posts and highlights of one target may be synced by parallel stages
+    save_lock = threading.Lock()
+
+    def __init__(self, target_dir):
+        self.path = os.path.join(target_dir, SYNC_STATE_FILE)
+        self.data = self.load()
+
+    def load(self):
+        """Stored state, or an empty one"""
+        data = {"last_post": 0, "highlights": {}}
+        if os.path.isfile(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data.update(json.load(f))
+            except ValueError:
+                pass
+        return data
+
+    @property
+    def last_post(self):
+        return self.data["last_post"]
+
+    def highlight(self, highlight_id):
+        """Stored {'count', 'last'} for a highlight, or None"""
+        return self.data["highlights"].get(str(highlight_id))
+
+    def set_last_post(self, timestamp):
+        self.data["last_post"] = max(self.data["last_post"], timestamp)
+
+    def set_highlight(self, highlight_id, count, last):
+        self.data["highlights"][str(highlight_id)] = {"count": count, "last": last}
+
+    def save(self):
+        """Merge into the stored state and write it atomically"""
+        with self.save_lock:
+            data = self.load()
+            data["last_post"] = max(data["last_post"], self.data["last_post"])
+            data["highlights"].update(self.data["highlights"])
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+            self.data = data
+
+
+class MediaDownloader:
+    """Download posts and story items on a bounded thread pool
+
+    Files are still written by instaloader itself, so naming under
+    downloads/{target} is unchanged."""
+
+    def __init__(self, loader, workers=DEFAULT_MEDIA_WORKERS, per_host=DEFAULT_PER_HOST):
+        self.loader = loader
+        self.workers = max(workers, 1)
+        self.per_host = max(per_host, 1)
+        self.host_limits = {}
+        self.lock = threading.Lock()
+
+    def _host_limit(self, item):
+        """Semaphore limiting connections to the item's media host"""
+        try:
+            host = urlparse(item.url).netloc
+        except Exception:
+            host = ""
+        with self.lock:
+            if host not in self.host_limits:
+                self.host_limits[host] = threading.BoundedSemaphore(self.per_host)
+            return self.host_limits[host]
+
+    def target_dir(self, target):
+        """Directory instaloader downloads a target's files into"""
+        return self.loader.dirname_pattern.format(target=target)
+
+    def download_all(self, items, download, target):
+        """Run `download(item, target=target)` for every item in parallel
+
+        Returns a stats dict with item and byte counts and rates; bytes are
+        the media files written by these downloads only."""
+        track_writes(self.loader.context)
+        in_flight = threading.BoundedSemaphore(self.workers * 2)
+        stats = {"items": 0, "failed": 0, "bytes": 0}
+        start = time.time()
+
+        def run(item):
+            sizes = []
+            WRITTEN_SIZES.set(sizes)
+            try:
+                with self._host_limit(item):
+                    download(item, target=target)
+                outcome = "items"
+            except Exception:
+                outcome = "failed"
+            finally:
+                in_flight.release()
+            with self.lock:
+                stats[outcome] += 1
+                stats["bytes"] += sum(sizes)
+
+        if self.workers == 1:
+            # On the calling thread, where profilers can see it
+            for item in items:
+                in_flight.acquire()
+                contextvars.copy_context().run(run, item)
+        else:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for item in items:
+                    in_flight.acquire()
+                    # Copy the context so requests still count towards the caller's stage
+                    executor.submit(contextvars.copy_context().run, run, item)
+
+        elapsed = max(time.time() - start, 1e-6)
+        stats["seconds"] = round(elapsed, 2)
+        stats["items_per_s"] = round(stats["items"] / elapsed, 2)
+        stats["bytes_per_s"] = round(stats["bytes"] / elapsed, 1)
+        return stats
+
+    def iter_new_posts(self, posts, state, newest):
+        """Yield posts newer than the last downloaded one, then stop paging
+
+        Pinned posts are skipped instead of ending the scan because they
+        are listed first regardless of their date. The newest timestamp
+        seen is recorded in newest[0]."""
+        for post in posts:
+            timestamp = utc_timestamp(post.date_utc)
+            if timestamp <= state.last_post:
+                if post.is_pinned:
+                    continue
+                return
+            newest[0] = max(newest[0], timestamp)
+            yield post
+
+    def sync_posts(self, profile, download):
+        """Download only posts published since the last synced post"""
+        state = SyncState(self.target_dir(profile.username))
+        newest = [0]
+        stats = self.download_all(self.iter_new_posts(profile.get_posts(), state, newest),
+                                  download, profile.username)
+        if not stats["failed"] and newest[0]:
+            state.set_last_post(newest[0])
+            state.save()
+        return stats
+
+    def sync_highlights(self, highlights, download, target):
+        """Download only highlight items added since the last sync
+
+        Highlights whose item count is unchanged are skipped without
+        downloading anything."""
+        state = SyncState(self.target_dir(target))
+        totals = {"items": 0, "failed": 0, "bytes": 0, "seconds": 0}
+
+        for highlight in highlights:
+            known = state.highlight(highlight.unique_id)
+            count = highlight.itemcount
+            if known and known["count"] == count:
+                continue
+
+            last = known["last"] if known else 0
+            items = [item for item in highlight.get_items() if utc_timestamp(item.date_utc) > last]
+            stats = self.download_all(items, download, target)
+            for key in totals:
+                totals[key] += stats[key]
+            if not stats["failed"]:
+                newest = max([utc_timestamp(item.date_utc) for item in items] + [last])
+                state.set_highlight(highlight.unique_id, count, newest)
+
+        state.save()
+        elapsed = max(totals["seconds"], 1e-6)
+        totals["items_per_s"] = round(totals["items"] / elapsed, 2)
+        totals["bytes_per_s"] = round(totals["bytes"] / elapsed, 1)
+        return totals
@@ -145,6 +145,21 @@ def get_limit_options():
             print_warning("Invalid number, using no limits")
             return None, None
 
+def get_worker_count():
+    """Get number of profiles to process concurrently"""
+    print_header("CONCURRENCY")
+    print(f"""
+       {Wh}Process several profiles at once (shared rate limit applies):
+       
+       {Wh}[{Gr}1{Wh}] {Cy}One at a time {Ye}(safest)
+       {Wh}[{Gr}2{Wh}] {Cy}2 workers
+       {Wh}[{Gr}3{Wh}] {Cy}4 workers
+       {Wh}[{Gr}4{Wh}] {Cy}8 workers {Ye}(fastest, higher block risk)
+    """)
+    
+    choice = get_menu_choice("Choose concurrency", ['1', '2', '3', '4'])
+    return {'1': 1, '2': 2, '3': 4, '4': 8}[choice]
+
 def confirm_action(message):
     """Ask user to confirm action"""
     response = input(f"\n       {Wh}[{Ye}?{Wh}] {message} {Ye}(y/n): {Wh}").strip().lower()
@@ -163,5 +178,8 @@ def display_summary(config):
         print(f"       {Wh}• Followers: {Ye}{config.get('limit_followers', 'All')}")
         print(f"       {Wh}• Following: {Ye}{config.get('limit_following', 'All')}")
     
+    if config.get('workers', 1) > 1:
+        print(f"\n       {Cy}Workers: {Ye}{config.get('workers')}")
+    
     print(f"\n       {Cy}Export Format: {Ye}{config.get('export_format', 'json')}")
     print()
@@ -0,0 +1,146 @@
+"""Per-target, per-stage run metrics for Instagram OSINT"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+METRICS_DIR = "metrics"
+METRIC_PREFIX = "instaosint"
+
+# Stage that requests made by the current thread/task are attributed to
+ACTIVE_STAGE = contextvars.ContextVar("active_stage", default=None)
+
+
+def file_size(*paths):
+    """Combined size in bytes of the files that exist"""
+    return sum(os.path.getsize(path) for path in paths if path and os.path.isfile(path))
+
+
+class StageSample:
+    """Counters of one stage execution"""
+
+    __slots__ = ("seconds", "requests", "items", "bytes")
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.requests = 0
+        self.items = 0
+        self.bytes = 0
+
+
+class RunMetrics:
+    """Collect wall time, requests, items and bytes per target and stage
+
+    Stages are measured with `stage(target, name)`; Instagram requests made
+    while a stage is active (also from worker threads started through
+    contextvars) are counted towards it via `count_request`."""
+
+    FIELDS = ("seconds", "requests", "items", "bytes")
+
+    def __init__(self):
+        self.started = time.time()
+        self.targets = {}
+        self.unattributed_requests = 0
+        self.throttles = 0
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, target, name):
+        """Measure a stage; set `items` and `bytes` on the yielded sample"""
+        sample = StageSample()
+        token = ACTIVE_STAGE.set(sample)
+        start = time.perf_counter()
+        try:
+            yield sample
+        finally:
+            sample.seconds = time.perf_counter() - start
+            ACTIVE_STAGE.reset(token)
+            self.add(target, name, sample)
+
+    def add(self, target, name, sample):
+        """Accumulate a finished stage sample"""
+        with self.lock:
+            stages = self.targets.setdefault(target, {})
+            totals = stages.setdefault(name, dict.fromkeys(self.FIELDS, 0))
+            for field in self.FIELDS:
+                totals[field] += getattr(sample, field)
+            totals["calls"] = totals.get("calls", 0) + 1
+
+    def count_request(self, query_type=None):
+        """Count an Instagram request towards the active stage"""
+        sample = ACTIVE_STAGE.get()
+        with self.lock:
+            if sample is None:
+                self.unattributed_requests += 1
+            else:
+                sample.requests += 1
+
+    def count_throttle(self, query_type=None):
+        """Count a 429 response"""
+        with self.lock:
+            self.throttles += 1
+
+    def to_dict(self):
+        """Metrics as a JSON-serializable dict"""
+        with self.lock:
+            targets = {
+                target: {name: {key: round(value, 4) if key == "seconds" else value
+                                for key, value in totals.items()}
+                         for name, totals in stages.items()}
+                for target, stages in self.targets.items()
+            }
+            return {
+                "started": datetime.fromtimestamp(self.started).isoformat(),
+                "duration_seconds": round(time.time() - self.started, 3),
+                "unattributed_requests": self.unattributed_requests,
+                "throttles": self.throttles,
+                "targets": targets
+            }
+
+    def to_prometheus(self):
+        """Metrics in the Prometheus text exposition format"""
+        data = self.to_dict()
+        lines = []
+        descriptions = {
+            "seconds": ("stage_seconds", "Wall time spent in a stage"),
+            "requests": ("stage_requests_total", "Instagram requests made during a stage"),
+            "items": ("stage_items_total", "Items processed in a stage"),
+            "bytes": ("stage_bytes_total", "Bytes written in a stage")
+        }
+        for field, (name, description) in descriptions.items():
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# HELP {metric} {description}")
+            lines.append(f"# TYPE {metric} {'gauge' if field == 'seconds' else 'counter'}")
+            for target, stages in data["targets"].items():
+                for stage, totals in stages.items():
+                    labels = f'target="{escape_label(target)}",stage="{escape_label(stage)}"'
+                    lines.append(f"{metric}{{{labels}}} {totals[field]}")
+
+        for name, description, value in (
+                ("run_duration_seconds", "Wall time of the whole run", data["duration_seconds"]),
+                ("unattributed_requests_total", "Requests made outside any stage", data["unattributed_requests"]),
+                ("throttles_total", "429 responses received", data["throttles"])):
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# HELP {metric} {description}")
+            lines.append(f"# TYPE {metric} {'gauge' if name.endswith('seconds') else 'counter'}")
+            lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory=METRICS_DIR):
+        """Write metrics_<timestamp>.json and .prom, return both paths"""
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        with open(base + ".json", 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        with open(base + ".prom", 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        return base + ".json", base + ".prom"
+
+
+def escape_label(value):
+    """Escape a Prometheus label value"""
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
@@ -1,30 +1,71 @@
 """Core processor for Instagram OSINT operations"""
 
 import instaloader
+import asyncio
+import functools
+import itertools
 import time
 import os
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from utils import print_info, print_warning, print_error, print_success, print_header, loading_animation
 from analyzer import ProfileAnalytics, ComparativeAnalytics
-from exporter import Exporter
+from exporter import Exporter, StreamingExport
 from database import OsintDatabase
+from ratelimit import TokenBucket, CountingRateController, AdaptiveRateController, is_throttle_error
+from checkpoint import CrawlCheckpoint
+from media import MediaDownloader, DEFAULT_MEDIA_WORKERS, DEFAULT_PER_HOST
+from metrics import RunMetrics, file_size
+from records import FollowerRecord, FollowerList
 
 SESSION_FILE = "session-{username}"
+RATE_STATE_FILE = "ratestate-{username}.json"  # Learned request pacing per session
 DOWNLOAD_DIR = "downloads"  # Directory for Instagram content
+DEFAULT_TARGETS_PER_MINUTE = 30  # Same pace as the old 2 second delay
+DEFAULT_CHUNK_SIZE = 1000  # Records per chunk when streaming followers
+DEFAULT_CHECKPOINT_PAGES = 25  # Follower pages between crawl checkpoints
+DEFAULT_KNOWN_STREAK = 50  # Consecutive known followers that end an incremental sync
 
 class InstagramOSINT:
     """Main processor for Instagram OSINT"""
     
-    def __init__(self, username=None, password=None, use_session=True, quiet=False):
+    def __init__(self, username=None, password=None, use_session=True, quiet=False,
+                 checkpoint_pages=DEFAULT_CHECKPOINT_PAGES, profile_cache=None,
+                 media_workers=DEFAULT_MEDIA_WORKERS, per_host=DEFAULT_PER_HOST, fast_update=False,
+                 adaptive_rate=False, metrics=None):
         self.username = username
         self.password = password
         self.use_session = use_session
         self.quiet = quiet
-        self.loader = instaloader.Instaloader(dirname_pattern=DOWNLOAD_DIR + "/{target}")
+        self.checkpoint_pages = checkpoint_pages
+        self.profile_cache = profile_cache
+        self.metrics = metrics or RunMetrics()
+        hooks = {'on_query': self.metrics.count_request, 'on_429': self.note_throttle}
+        if adaptive_rate:
+            state_file = RATE_STATE_FILE.format(username=username) if username else None
+            rate_controller = lambda context: AdaptiveRateController(context, state_file, **hooks)
+        else:
+            rate_controller = lambda context: CountingRateController(context, **hooks)
+        self.loader = instaloader.Instaloader(dirname_pattern=DOWNLOAD_DIR + "/{target}",
+                                              rate_controller=rate_controller)
         self.is_logged_in = False
+        self.media = MediaDownloader(self.loader, media_workers, per_host)
+        self.fast_update = fast_update
+        self.throttled_at = 0  # Last time Instagram throttled or challenged this session
         
         # Create download directory if it doesn't exist
         os.makedirs(DOWNLOAD_DIR, exist_ok=True)
     
+    def note_error(self, error):
+        """Remember when a request failed because the session was throttled"""
+        if is_throttle_error(error):
+            self.throttled_at = time.time()
+    
+    def note_throttle(self, query_type=None):
+        """Count a 429 that instaloader retries itself and mark the session throttled"""
+        self.throttled_at = time.time()
+        self.metrics.count_throttle(query_type)
+    
     def load_session(self):
         """Load saved session if available"""
         if not self.use_session or not self.username:
@@ -83,100 +124,287 @@ class InstagramOSINT:
         
         return False
     
-    def fetch_profile(self, target_username):
-        """Fetch profile data"""
+    def fetch_profile(self, target_username, use_cache=True):
+        """Fetch profile data (`use_cache=False` always fetches a fresh copy)"""
         if not self.is_logged_in:
             print_error("Not logged in")
             return None
         
-        try:
-            profile = instaloader.Profile.from_username(self.loader.context, target_username)
-            return profile
-        except instaloader.exceptions.ProfileNotExistsException:
-            print_error(f"Profile '{target_username}' does not exist")
-            return None
-        except Exception as e:
-            print_error(f"Error fetching profile: {str(e)}")
-            return None
+        with self.metrics.stage(target_username, "profile") as stage:
+            if self.profile_cache and use_cache:
+                profile = self.profile_cache.get(self.loader.context, target_username)
+                if profile:
+                    stage.items = 1
+                    return profile
+            
+            try:
+                profile = instaloader.Profile.from_username(self.loader.context, target_username)
+                if self.profile_cache:
+                    self.profile_cache.put(profile)
+                stage.items = 1
+                return profile
+            except instaloader.exceptions.ProfileNotExistsException:
+                print_error(f"Profile '{target_username}' does not exist")
+                return None
+            except Exception as e:
+                self.note_error(e)
+                print_error(f"Error fetching profile: {str(e)}")
+                return None
+    
+    def print_cache_stats(self):
+        """Print profile cache hit/miss counters"""
+        if self.profile_cache and not self.quiet:
+            stats = self.profile_cache.stats()
+            print_info(f"Profile cache: {stats['hits']} hits, {stats['misses']} misses "
+                       f"({stats['hit_rate']}% hit rate)")
     
-    def fetch_followers(self, profile, limit=None):
-        """Fetch followers list"""
+    def iter_edges(self, profile, edge="followers", limit=None, resumable=True):
+        """Yield follower or following records, checkpointing full crawls so they resume"""
+        if edge == "followers":
+            iterator = profile.get_followers()
+        else:
+            iterator = profile.get_followees()
+        
+        checkpoint = None
+        if resumable and self.checkpoint_pages and not limit and isinstance(iterator, instaloader.NodeIterator):
+            checkpoint = CrawlCheckpoint(profile.username, edge)
+        
+        count = 0
+        if checkpoint:
+            resumed = checkpoint.resume(iterator)
+            if resumed and not self.quiet:
+                print_info(f"Resuming {edge} of {profile.username} after {resumed} records")
+            for record in checkpoint.replay(resumed):
+                yield FollowerRecord.from_dict(record)
+                count += 1
+            checkpoint.open_spool(resumed)
+            pages_items = iterator.page_length() * self.checkpoint_pages
+        
         try:
-            followers = []
-            count = 0
-            for follower in profile.get_followers():
-                followers.append({
-                    "username": follower.username,
-                    "user_id": follower.userid,
-                    "full_name": follower.full_name
-                })
+            for user in iterator:
+                record = FollowerRecord(user.username, user.userid, user.full_name)
+                if checkpoint:
+                    checkpoint.append(record)
+                    if iterator.total_index % pages_items == 0:
+                        checkpoint.save(iterator.freeze())
+                yield record
                 count += 1
                 if limit and count >= limit:
                     break
-            
-            if not self.quiet:
-                print_success(f"Fetched {len(followers)} followers")
-            return followers
-        except Exception as e:
-            print_error(f"Error fetching followers: {str(e)}")
-            return []
+        except (Exception, KeyboardInterrupt):
+            if checkpoint:
+                checkpoint.save(iterator.freeze())
+            raise
+        finally:
+            if checkpoint:
+                checkpoint.close()
+        
+        if checkpoint:
+            checkpoint.clear()
     
-    def fetch_following(self, profile, limit=None):
-        """Fetch following list"""
+    def iter_new_edges(self, profile, edge, limit=None, is_known=None, stop_after=DEFAULT_KNOWN_STREAK):
+        """Yield only records not yet known, stopping after a run of known ones"""
+        source = self.iter_edges(profile, edge, resumable=False)
+        batch_size = instaloader.NodeIterator.page_length()
+        streak = 0
+        count = 0
+        
         try:
-            following = []
-            count = 0
-            for followee in profile.get_followees():
-                following.append({
-                    "username": followee.username,
-                    "user_id": followee.userid,
-                    "full_name": followee.full_name
-                })
-                count += 1
-                if limit and count >= limit:
-                    break
-            
-            if not self.quiet:
-                print_success(f"Fetched {len(following)} following")
-            return following
-        except Exception as e:
-            print_error(f"Error fetching following: {str(e)}")
-            return []
+            while True:
+                batch = list(itertools.islice(source, batch_size))
+                if not batch:
+                    return
+                known = is_known([record["user_id"] for record in batch])
+                for record in batch:
+                    if record["user_id"] in known:
+                        streak += 1
+                        if streak >= stop_after:
+                            return
+                        continue
+                    streak = 0
+                    yield record
+                    count += 1
+                    if limit and count >= limit:
+                        return
+        finally:
+            source.close()
+    
+    def select_edges(self, profile, edge, limit=None, is_known=None):
+        """Iterate all records, or only new ones when `is_known` is given"""
+        if is_known:
+            return self.iter_new_edges(profile, edge, limit, is_known)
+        return self.iter_edges(profile, edge, limit)
+    
+    def incremental_filter(self, profile, edge, options):
+        """Known-edge lookup for --incremental runs, None otherwise"""
+        if not (options.get('incremental') and options.get('db')):
+            return None
+        db = OsintDatabase()
+        return lambda user_ids: db.filter_known_edges(profile.username, edge, user_ids)
+    
+    @staticmethod
+    def crawl_complete(count, limit=None, is_known=None):
+        """Whether a crawl that ended without error returned every record"""
+        return not is_known and not (limit and count >= limit)
+    
+    def fetch_followers(self, profile, limit=None, is_known=None):
+        """Fetch followers list (only unknown ones if `is_known` is given)"""
+        with self.metrics.stage(profile.username, "followers") as stage:
+            try:
+                followers = FollowerList(self.select_edges(profile, "followers", limit, is_known))
+                followers.complete = self.crawl_complete(len(followers), limit, is_known)
+                stage.items = len(followers)
+                
+                if not self.quiet:
+                    print_success(f"Fetched {len(followers)} {'new ' if is_known else ''}followers")
+                return followers
+            except Exception as e:
+                self.note_error(e)
+                print_error(f"Error fetching followers: {str(e)}")
+                return FollowerList(complete=False)
+    
+    def fetch_following(self, profile, limit=None, is_known=None):
+        """Fetch following list (only unknown ones if `is_known` is given)"""
+        with self.metrics.stage(profile.username, "following") as stage:
+            try:
+                following = FollowerList(self.select_edges(profile, "following", limit, is_known))
+                following.complete = self.crawl_complete(len(following), limit, is_known)
+                stage.items = len(following)
+                
+                if not self.quiet:
+                    print_success(f"Fetched {len(following)} {'new ' if is_known else ''}following")
+                return following
+            except Exception as e:
+                self.note_error(e)
+                print_error(f"Error fetching following: {str(e)}")
+                return FollowerList(complete=False)
+    
+    def stream_edges(self, profile, edge, limit=None, sinks=(), chunk_size=DEFAULT_CHUNK_SIZE, is_known=None):
+        """Feed records to sinks in chunks, return (count, whether every record was streamed)"""
+        count = 0
+        complete = False
+        chunk = []
+        
+        def flush():
+            for sink in sinks:
+                sink(chunk)
+        
+        with self.metrics.stage(profile.username, edge) as stage:
+            try:
+                for record in self.select_edges(profile, edge, limit, is_known):
+                    chunk.append(record)
+                    count += 1
+                    if len(chunk) >= chunk_size:
+                        flush()
+                        chunk = []
+                if chunk:
+                    flush()
+                complete = self.crawl_complete(count, limit, is_known)
+                
+                if not self.quiet:
+                    print_success(f"Streamed {count} {edge}")
+            except Exception as e:
+                self.note_error(e)
+                print_error(f"Error fetching {edge}: {str(e)}")
+            stage.items = count
+        
+        return count, complete
+    
+    def print_download_stats(self, label, stats):
+        """Print media download counters and throughput"""
+        if not self.quiet and stats["items"] > 0:
+            print_success(f"Downloaded {stats['items']} {label} in {stats['seconds']}s "
+                          f"({stats['items_per_s']} items/s, {stats['bytes_per_s'] / 1024:.1f} KB/s)")
+        if not self.quiet and stats["failed"]:
+            print_warning(f"{stats['failed']} {label} failed to download")
     
     def download_posts(self, profile):
         """Download profile posts"""
         if not self.is_logged_in:
             return
         
-        try:
-            count = 0
-            for post in profile.get_posts():
-                self.loader.download_post(post, target=profile.username)
-                count += 1
-            
-            if not self.quiet and count > 0:
-                print_success(f"Downloaded {count} posts")
-        except Exception as e:
-            if not self.quiet:
-                print_warning(f"Error downloading posts: {str(e)}")
+        with self.metrics.stage(profile.username, "posts") as stage:
+            try:
+                if self.fast_update:
+                    stats = self.media.sync_posts(profile, self.loader.download_post)
+                else:
+                    stats = self.media.download_all(profile.get_posts(), self.loader.download_post,
+                                                    profile.username)
+                stage.items, stage.bytes = stats["items"], stats["bytes"]
+                self.print_download_stats("posts", stats)
+            except Exception as e:
+                self.note_error(e)
+                if not self.quiet:
+                    print_warning(f"Error downloading posts: {str(e)}")
     
     def download_highlights(self, profile):
         """Download profile highlights"""
         if not self.is_logged_in:
             return
         
-        try:
-            count = 0
-            for highlight in self.loader.get_highlights(profile):
-                for item in highlight.get_items():
-                    self.loader.download_storyitem(item, target=profile.username)
-                    count += 1
-            
-            if not self.quiet and count > 0:
-                print_success(f"Downloaded {count} highlight items")
-        except Exception as e:
+        with self.metrics.stage(profile.username, "highlights") as stage:
+            try:
+                if self.fast_update:
+                    stats = self.media.sync_highlights(self.loader.get_highlights(profile),
+                                                       self.loader.download_storyitem, profile.username)
+                else:
+                    items = (item for highlight in self.loader.get_highlights(profile)
+                             for item in highlight.get_items())
+                    stats = self.media.download_all(items, self.loader.download_storyitem, profile.username)
+                stage.items, stage.bytes = stats["items"], stats["bytes"]
+                self.print_download_stats("highlight items", stats)
+            except Exception as e:
+                self.note_error(e)
+                if not self.quiet:
+                    print_warning(f"Error downloading highlights: {str(e)}")
+    
+    def print_profile_summary(self, profile):
+        """Print basic profile metadata"""
+        if not self.quiet:
+            print_info(f"Full Name: {profile.full_name}")
+            print_info(f"ID: {profile.userid}")
+            print_info(f"Followers: {profile.followers}")
+            print_info(f"Following: {profile.followees}")
+            print_info(f"Posts: {profile.mediacount}")
+    
+    def run_analytics(self, profile, options):
+        """Calculate analytics if enabled in options"""
+        analytics = None
+        if options.get('analyze'):
+            with self.metrics.stage(profile.username, "analytics") as stage:
+                analytics = ProfileAnalytics(profile).get_analytics_summary()
+                stage.items = 1
+            if not self.quiet and analytics:
+                print_header("ANALYTICS")
+                print_info(f"Profile Type: {analytics.get('profile_type')}")
+                print_info(f"Engagement Rate: {analytics.get('engagement_rate')}")
+                print_info(f"Follower Ratio: {analytics.get('follower_ratio')}")
+                print_info(f"Risk Score: {analytics.get('risk_score')}/100")
+        return analytics
+    
+    def save_to_database(self, profile, followers, following, analytics, options):
+        """Store profile, followers, following and analytics if enabled in options"""
+        if options.get('db'):
+            with self.metrics.stage(profile.username, "database") as stage:
+                db = OsintDatabase()
+                db_files = (db.db_name, db.db_name + "-wal")
+                size_before = file_size(*db_files)
+                # One timestamp for the whole snapshot
+                recorded_at = datetime.now()
+                db.save_profile(profile, recorded_at)
+                db.save_followers(profile.username, followers, recorded_at, followers.complete)
+                followers_stats = db.last_write_stats
+                db.save_following(profile.username, following, recorded_at, following.complete)
+                if analytics:
+                    db.save_analytics(profile.username, analytics)
+                stage.items = 1 + len(followers) + len(following)
+                stage.bytes = max(file_size(*db_files) - size_before, 0)
             if not self.quiet:
-                print_warning(f"Error downloading highlights: {str(e)}")
+                print_success("Data saved to database")
+                if followers_stats and followers_stats["rows"]:
+                    print_info(f"Followers snapshot: +{followers_stats['added']} -{followers_stats['removed']} "
+                               f"({followers_stats['rows']} rows in {followers_stats['seconds']}s, "
+                               f"{followers_stats['rows_per_s']} rows/s)")
     
     def process_profile(self, target_username, options=None):
         """Complete profile processing pipeline"""
@@ -186,72 +414,208 @@ class InstagramOSINT:
             print_header(f"PROCESSING {target_username}")
         
         # Fetch profile
-        profile = self.fetch_profile(target_username)
+        # Counts saved to the database must not come from the cache
+        profile = self.fetch_profile(target_username, use_cache=not options.get('db'))
         if not profile:
             return None
         
-        if not self.quiet:
-            print_info(f"Full Name: {profile.full_name}")
-            print_info(f"ID: {profile.userid}")
-            print_info(f"Followers: {profile.followers}")
-            print_info(f"Following: {profile.followees}")
-            print_info(f"Posts: {profile.mediacount}")
+        self.print_profile_summary(profile)
+        
+        if options.get('stream'):
+            return self.process_profile_streaming(profile, options)
         
         # Fetch followers and following
-        followers = self.fetch_followers(profile, options.get('limit_followers'))
-        following = self.fetch_following(profile, options.get('limit_following'))
+        followers = self.fetch_followers(profile, options.get('limit_followers'),
+                                         self.incremental_filter(profile, "followers", options))
+        following = self.fetch_following(profile, options.get('limit_following'),
+                                         self.incremental_filter(profile, "following", options))
         
         # Calculate analytics
-        analytics = None
-        if options.get('analyze'):
-            analytics = ProfileAnalytics(profile).get_analytics_summary()
-            if not self.quiet and analytics:
-                print_header("ANALYTICS")
-                print_info(f"Profile Type: {analytics.get('profile_type')}")
-                print_info(f"Engagement Rate: {analytics.get('engagement_rate')}")
-                print_info(f"Follower Ratio: {analytics.get('follower_ratio')}")
-                print_info(f"Risk Score: {analytics.get('risk_score')}/100")
+        analytics = self.run_analytics(profile, options)
         
         # Store in database
+        self.save_to_database(profile, followers, following, analytics, options)
+        
+        # Download content
+        if not options.get('no_download'):
+            self.download_posts(profile)
+            self.download_highlights(profile)
+        
+        # Export data
+        results = {
+            "profile": profile,
+            "followers": followers,
+            "following": following,
+            "analytics": analytics
+        }
+        
+        return results
+    
+    def process_profile_streaming(self, profile, options):
+        """Stream followers and following into the database and exporters chunk by chunk"""
+        chunk_size = options.get('chunk_size') or DEFAULT_CHUNK_SIZE
+        exports = StreamingExport(profile, profile.username, options.get('export_formats', 'json'))
+        db = None
         if options.get('db'):
             db = OsintDatabase()
-            db.save_profile(profile)
-            db.save_followers(profile.username, followers)
+            recorded_at = datetime.now()
+            db.save_profile(profile, recorded_at)
+        
+        follower_sinks = [lambda chunk: exports.write("followers", chunk)]
+        following_sinks = [lambda chunk: exports.write("following", chunk)]
+        if db:
+            # Chunks reach follower_edges as they arrive, unseen edges are closed at the end
+            follower_snapshot = db.snapshot(profile.username, "followers", recorded_at)
+            following_snapshot = db.snapshot(profile.username, "following", recorded_at)
+            follower_sinks.append(follower_snapshot.add)
+            following_sinks.append(following_snapshot.add)
+        
+        followers_count, followers_complete = self.stream_edges(
+            profile, "followers", options.get('limit_followers'), follower_sinks, chunk_size,
+            self.incremental_filter(profile, "followers", options))
+        following_count, following_complete = self.stream_edges(
+            profile, "following", options.get('limit_following'), following_sinks, chunk_size,
+            self.incremental_filter(profile, "following", options))
+        if db:
+            follower_snapshot.finish(followers_complete)
+            following_snapshot.finish(following_complete)
+        
+        # Calculate analytics
+        analytics = self.run_analytics(profile, options)
+        
+        if db:
             if analytics:
                 db.save_analytics(profile.username, analytics)
             if not self.quiet:
                 print_success("Data saved to database")
         
+        with self.metrics.stage(profile.username, "export") as stage:
+            exported_files = exports.close(analytics)
+            stage.items = followers_count + following_count
+            stage.bytes = file_size(*exported_files)
+        
         # Download content
         if not options.get('no_download'):
             self.download_posts(profile)
             self.download_highlights(profile)
         
-        # Export data
-        results = {
+        return {
+            "profile": profile,
+            "followers": None,
+            "following": None,
+            "followers_count": followers_count,
+            "following_count": following_count,
+            "analytics": analytics,
+            "streamed": True,
+            "exported_files": exported_files
+        }
+    
+    async def process_profile_async(self, target_username, options=None):
+        """Profile pipeline fetching followers, following, posts and highlights concurrently"""
+        options = options or {}
+        loop = asyncio.get_running_loop()
+        stage_limit = asyncio.Semaphore(max(options.get('stage_concurrency') or 4, 1))
+        
+        async def run_stage(func, *args):
+            async with stage_limit:
+                return await loop.run_in_executor(None, functools.partial(func, *args))
+        
+        if not self.quiet:
+            print_header(f"PROCESSING {target_username}")
+        
+        # Fetch profile
+        profile = await run_stage(self.fetch_profile, target_username, not options.get('db'))
+        if not profile:
+            return None
+        
+        self.print_profile_summary(profile)
+        
+        # Fetch followers, following and content at the same time
+        stages = [
+            run_stage(self.fetch_followers, profile, options.get('limit_followers'),
+                      self.incremental_filter(profile, "followers", options)),
+            run_stage(self.fetch_following, profile, options.get('limit_following'),
+                      self.incremental_filter(profile, "following", options))
+        ]
+        if not options.get('no_download'):
+            stages.append(run_stage(self.download_posts, profile))
+            stages.append(run_stage(self.download_highlights, profile))
+        
+        followers, following, *_ = await asyncio.gather(*stages)
+        
+        # Calculate analytics
+        analytics = self.run_analytics(profile, options)
+        
+        # Store in database
+        self.save_to_database(profile, followers, following, analytics, options)
+        
+        return {
             "profile": profile,
             "followers": followers,
             "following": following,
             "analytics": analytics
         }
-        
-        return results
     
-    def batch_process(self, target_list, options=None):
-        """Process multiple targets"""
+    def run_pipeline(self, target_username, options=None):
+        """Run the sequential or concurrent-stage pipeline based on options"""
         options = options or {}
-        results = []
+        if options.get('parallel_stages') and not options.get('stream'):
+            return asyncio.run(self.process_profile_async(target_username, options))
+        return self.process_profile(target_username, options)
+    
+    def batch_process(self, target_list, options=None, on_result=None, runner=None):
+        """Process targets on a bounded worker pool, passing each result to on_result if given"""
+        options = options or {}
+        runner = runner or self.run_pipeline
+        workers = max(options.get('workers') or 1, 1)
+        rate = options.get('rate_limit')
+        if rate is None:
+            rate = DEFAULT_TARGETS_PER_MINUTE
+        limiter = TokenBucket.per_minute(rate, capacity=workers)
+        results = {}
+        completed = 0
         
-        for target in target_list:
-            result = self.process_profile(target, options)
-            if result:
-                results.append(result)
-            time.sleep(2)  # Rate limiting
+        def run(target):
+            limiter.acquire()
+            return runner(target, options)
         
-        return results
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run, target): idx for idx, target in enumerate(target_list)}
+            for future in as_completed(futures):
+                idx = futures[future]
+                target = target_list[idx]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print_error(f"Error processing {target}: {str(e)}")
+                    result = None
+                
+                if result:
+                    completed += 1
+                    if on_result is None:
+                        results[idx] = result
+                if on_result:
+                    on_result(target, result)
+        
+        elapsed = time.time() - start
+        if not self.quiet and target_list:
+            per_minute = completed / elapsed * 60 if elapsed > 0 else 0
+            print_info(f"Processed {completed}/{len(target_list)} targets in {elapsed:.1f}s "
+                       f"({per_minute:.1f} targets/min)")
+        
+        # Keep results in the order the targets were given
+        return [results[idx] for idx in sorted(results)]
     
     def export_results(self, results, target_username, formats='json'):
         """Export results in specified formats"""
+        if results.get('streamed'):
+            # Already written while streaming
+            if not self.quiet:
+                for file in results['exported_files']:
+                    print_success(f"Exported: {file}")
+            return list(results['exported_files'])
+        
         profile = results['profile']
         followers = results['followers']
         following = results['following']
@@ -260,27 +624,30 @@ class InstagramOSINT:
         format_list = [f.strip().lower() for f in formats.split(',')]
         exported_files = []
         
-        for fmt in format_list:
-            try:
-                if fmt == 'json':
-                    file = Exporter.export_json(profile, followers, following, target_username, analytics)
-                    exported_files.append(file)
-                    if not self.quiet:
-                        print_success(f"Exported to JSON: {file}")
-                
-                elif fmt == 'csv':
-                    files = Exporter.export_csv(profile, followers, following, target_username)
-                    exported_files.extend(files)
-                    if not self.quiet:
-                        for file in files:
-                            print_success(f"Exported to CSV: {file}")
-                
-                elif fmt == 'html':
-                    file = Exporter.export_html(profile, followers, following, target_username, analytics)
-                    exported_files.append(file)
-                    if not self.quiet:
-                        print_success(f"Exported to HTML: {file}")
-            except Exception as e:
-                print_error(f"Error exporting to {fmt}: {str(e)}")
+        with self.metrics.stage(target_username, "export") as stage:
+            for fmt in format_list:
+                try:
+                    if fmt == 'json':
+                        file = Exporter.export_json(profile, followers, following, target_username, analytics)
+                        exported_files.append(file)
+                        if not self.quiet:
+                            print_success(f"Exported to JSON: {file}")
+                    
+                    elif fmt == 'csv':
+                        files = Exporter.export_csv(profile, followers, following, target_username)
+                        exported_files.extend(files)
+                        if not self.quiet:
+                            for file in files:
+                                print_success(f"Exported to CSV: {file}")
+                    
+                    elif fmt == 'html':
+                        file = Exporter.export_html(profile, followers, following, target_username, analytics)
+                        exported_files.append(file)
+                        if not self.quiet:
+                            print_success(f"Exported to HTML: {file}")
+                except Exception as e:
+                    print_error(f"Error exporting to {fmt}: {str(e)}")
+            stage.items = len(followers) + len(following)
+            stage.bytes = file_size(*exported_files)
         
         return exported_files
@@ -0,0 +1,125 @@
+"""cProfile/tracemalloc profiling of CLI runs"""
+
+import cProfile
+import io
+import os
+import pstats
+import re
+import threading
+import tracemalloc
+from datetime import datetime
+
+PROFILE_DIR = "profiles"
+TOP_HOTSPOTS = 40
+TOP_ALLOCATIONS = 25
+TRACE_FRAMES = 10
+
+
+def safe_name(name):
+    """Filesystem-safe version of a target name"""
+    return re.sub(r'[^A-Za-z0-9._-]', '_', name) or "target"
+
+
+class RunProfiler:
+    """Profile each target of a run separately
+
+    `run(target, func, *args)` executes func under that target's cProfile
+    profile (reused across calls, so pipeline and export add up) and
+    records the allocation sites that grew while it ran. `write()` dumps
+    per-target hotspot and allocation reports plus a merged hotspot
+    report for the whole run."""
+
+    def __init__(self, directory=PROFILE_DIR, top=TOP_HOTSPOTS, top_allocations=TOP_ALLOCATIONS):
+        self.directory = os.path.join(directory, f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        self.top = top
+        self.top_allocations = top_allocations
+        self.profiles = {}
+        self.allocations = {}
+        self.lock = threading.Lock()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+
+    def _profile(self, target):
+        with self.lock:
+            if target not in self.profiles:
+                self.profiles[target] = cProfile.Profile()
+                self.allocations[target] = []
+            return self.profiles[target]
+
+    def run(self, target, func, *args, label=None, **kwargs):
+        """Call func under the target's profile and allocation tracking"""
+        profile = self._profile(target)
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is already active, run untraced
+            profile = None
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if profile:
+                profile.disable()
+            peak = tracemalloc.get_traced_memory()[1]
+            diff = tracemalloc.take_snapshot().compare_to(before, 'lineno')
+            with self.lock:
+                self.allocations[target].append((label or getattr(func, "__name__", "run"), peak,
+                                                 diff[:self.top_allocations]))
+
+    def wrap(self, runner, label=None):
+        """runner(target, options) profiled per target"""
+        def profiled(target, options=None):
+            return self.run(target, runner, target, options, label=label)
+        return profiled
+
+    def hotspot_report(self, stats, title):
+        """Text report sorted by cumulative and by own time"""
+        out = io.StringIO()
+        out.write(f"{title}\n{'=' * len(title)}\n\n")
+        stats.stream = out
+        out.write("By cumulative time\n")
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        out.write("\nBy own time\n")
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top)
+        return out.getvalue()
+
+    def allocation_report(self, target):
+        """Top allocation sites of each profiled call for a target"""
+        lines = [f"Allocations for {target}", ""]
+        for label, peak, diff in self.allocations[target]:
+            lines.append(f"[{label}] peak traced memory: {peak / 1048576:.1f} MiB")
+            for stat in diff:
+                frame = stat.traceback[0]
+                lines.append(f"  {stat.size_diff / 1024:+10.1f} KiB {stat.count_diff:+8d} blocks  "
+                             f"{frame.filename}:{frame.lineno}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def write(self):
+        """Write all reports, return the output directory"""
+        os.makedirs(self.directory, exist_ok=True)
+        merged = None
+
+        for target, profile in self.profiles.items():
+            base = os.path.join(self.directory, safe_name(target))
+            with open(base + "_allocations.txt", 'w', encoding='utf-8') as f:
+                f.write(self.allocation_report(target))
+            try:
+                stats = pstats.Stats(profile)
+            except TypeError:
+                # Profile never collected any data
+                continue
+            profile.dump_stats(base + ".prof")
+            with open(base + "_hotspots.txt", 'w', encoding='utf-8') as f:
+                f.write(self.hotspot_report(stats, f"Hotspots for {target}"))
+            if merged is None:
+                merged = pstats.Stats(profile)
+            else:
+                merged.add(profile)
+
+        if merged:
+            merged.dump_stats(os.path.join(self.directory, "run.prof"))
+            with open(os.path.join(self.directory, "hotspots.txt"), 'w', encoding='utf-8') as f:
+                f.write(self.hotspot_report(merged, f"Hotspots for {len(self.profiles)} target(s)"))
+        return self.directory
@@ -0,0 +1,219 @@
+"""Rate limiting primitives for Instagram OSINT"""
+
+import json
+import os
+import random
+import threading
+import time
+import instaloader
+
+# Phrases Instagram uses when an account is challenged or blocked
+CHALLENGE_MARKERS = ("checkpoint", "challenge", "feedback_required", "please wait a few minutes")
+
+
+def is_throttle_error(error):
+    """Whether an exception means the session is throttled or challenged"""
+    if isinstance(error, (instaloader.exceptions.TooManyRequestsException,
+                          instaloader.exceptions.LoginRequiredException,
+                          instaloader.exceptions.QueryReturnedForbiddenException)):
+        return True
+    message = str(error).lower()
+    return "429" in message or any(marker in message for marker in CHALLENGE_MARKERS)
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by concurrent workers"""
+
+    def __init__(self, rate, capacity=1):
+        # rate is in tokens per second; None or 0 disables limiting
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        """Add tokens earned since the last update"""
+        elapsed = now - self.updated
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens=1):
+        """Take tokens if available right now, without blocking"""
+        if not self.rate:
+            return True
+
+        with self.lock:
+            self._refill(time.monotonic())
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens=1):
+        """Block until the requested number of tokens is available"""
+        if not self.rate:
+            return
+
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+    @classmethod
+    def per_minute(cls, count, capacity=1):
+        """Build a bucket allowing `count` acquisitions per minute"""
+        return cls(count / 60.0 if count else None, capacity)
+
+
+class CountingRateController(instaloader.RateController):
+    """instaloader's RateController reporting every request and 429"""
+
+    def __init__(self, context, on_query=None, on_429=None):
+        super().__init__(context)
+        self.on_query = on_query
+        self.on_429 = on_429
+
+    def wait_before_query(self, query_type):
+        super().wait_before_query(query_type)
+        if self.on_query:
+            self.on_query(query_type)
+
+    def handle_429(self, query_type):
+        if self.on_429:
+            self.on_429(query_type)
+        super().handle_429(query_type)
+
+
+class AdaptiveRateController(CountingRateController):
+    """AIMD request pacing on top of instaloader's own rate controller
+
+    The request rate grows additively while Instagram answers normally and
+    is cut multiplicatively on 429s or when response latency climbs well
+    above its baseline (timed from each query's release to the end of its
+    context.get_json call). Request starts are spaced across all threads
+    sharing the context, with jitter. The learned rate and latency are
+    persisted per session so the next run starts where this one ended."""
+
+    MIN_RATE = 0.05  # requests per second
+    MAX_RATE = 2.0
+    INCREASE = 0.01  # additive step per successful request
+    DECREASE = 0.5  # multiplicative cut on throttling
+    SLOW_DECREASE = 0.9  # multiplicative cut when latency climbs
+    JITTER = 0.2
+    SAVE_EVERY = 20  # requests between state saves
+    LATENCY_WEIGHT = 0.2  # EWMA weight of a new response time
+    BASELINE_WEIGHT = 0.02  # the baseline follows response times slowly
+
+    def __init__(self, context, state_file=None, initial_rate=0.5, on_query=None, on_429=None):
+        super().__init__(context, on_query, on_429)
+        self.state_file = state_file
+        self.rate = initial_rate
+        self.latency = None
+        self.baseline_latency = None
+        self.throttles = 0
+        self.requests = 0
+        self.next_slot = 0.0
+        self.state_lock = threading.Lock()
+        self.request_starts = threading.local()
+        self.load_state()
+        self.track_requests()
+
+    def load_state(self):
+        """Restore rate and latency learned in earlier runs"""
+        if not self.state_file or not os.path.isfile(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.rate = min(max(state.get("rate", self.rate), self.MIN_RATE), self.MAX_RATE)
+            self.latency = state.get("latency")
+            self.baseline_latency = state.get("baseline_latency")
+        except (ValueError, OSError):
+            pass
+
+    def save_state(self):
+        """Persist the current pacing state"""
+        if not self.state_file:
+            return
+        state = {
+            "rate": round(self.rate, 4),
+            "latency": self.latency,
+            "baseline_latency": self.baseline_latency,
+            "throttles": self.throttles,
+            "updated": time.time()
+        }
+        tmp_path = self.state_file + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_file)
+
+    def observe_latency(self, sample):
+        """Update the latency estimates with one response time in seconds"""
+        with self.state_lock:
+            if self.latency is None:
+                self.latency = sample
+            else:
+                self.latency += self.LATENCY_WEIGHT * (sample - self.latency)
+            if self.baseline_latency is None:
+                self.baseline_latency = sample
+            else:
+                self.baseline_latency += self.BASELINE_WEIGHT * (sample - self.baseline_latency)
+
+    def finish_request(self):
+        """Time the query this thread released last, if it is still open"""
+        start = getattr(self.request_starts, "start", None)
+        if start is not None:
+            self.request_starts.start = None
+            self.observe_latency(time.monotonic() - start)
+
+    def track_requests(self):
+        """Time every context.get_json call, including those on copied sessions"""
+        context = self._context
+        get_json = context.get_json
+
+        def timed_get_json(*args, **kwargs):
+            try:
+                return get_json(*args, **kwargs)
+            finally:
+                self.finish_request()
+
+        context.get_json = timed_get_json
+
+    def wait_before_query(self, query_type):
+        with self.state_lock:
+            now = time.monotonic()
+            if self.latency is not None and self.baseline_latency is not None \
+                    and self.latency > 2 * self.baseline_latency + 0.25:
+                self.rate = max(self.rate * self.SLOW_DECREASE, self.MIN_RATE)
+            else:
+                self.rate = min(self.rate + self.INCREASE, self.MAX_RATE)
+
+            interval = 1.0 / self.rate * random.uniform(1 - self.JITTER, 1 + self.JITTER)
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + interval
+            self.requests += 1
+            save = self.requests % self.SAVE_EVERY == 0
+
+        if slot > now:
+            self.sleep(slot - now)
+        # Keep instaloader's sliding-window limits as a safety net
+        super().wait_before_query(query_type)
+
+        if save:
+            self.save_state()
+        self.request_starts.start = time.monotonic()
+
+    def handle_429(self, query_type):
+        self.finish_request()
+        with self.state_lock:
+            self.throttles += 1
+            self.rate = max(self.rate * self.DECREASE, self.MIN_RATE)
+            self.next_slot = time.monotonic() + 1.0 / self.rate
+        self.save_state()
+        super().handle_429(query_type)
@@ -0,0 +1,185 @@
+"""Compact follower/following records"""
+
+from array import array
+
+FIELDS = ("username", "user_id", "full_name")
+_KEYS = dict.fromkeys(FIELDS).keys()
+_NO_ID = -1  # Stored for records without a user id
+
+
+class FollowerRecord:
+    """One follower or followee
+
+    Uses __slots__ instead of a dict but supports the read-only mapping
+    interface (`record["username"]`, `record.get(...)`, `keys()`,
+    `dict(record)`) that follower dicts were used with."""
+
+    __slots__ = FIELDS
+
+    def __init__(self, username, user_id, full_name):
+        self.username = username
+        self.user_id = user_id
+        self.full_name = full_name
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("username"), data.get("user_id"), data.get("full_name"))
+
+    def __getitem__(self, key):
+        if key not in _KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in _KEYS else default
+
+    def keys(self):
+        return _KEYS
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def __contains__(self, key):
+        return key in _KEYS
+
+    def __eq__(self, other):
+        if isinstance(other, (FollowerRecord, dict)):
+            return all(self.get(key) == other.get(key) for key in FIELDS) and len(other) == len(FIELDS)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"FollowerRecord(username={self.username!r}, user_id={self.user_id!r}, full_name={self.full_name!r})"
+
+    def as_row(self):
+        """(username, user_id, full_name) tuple"""
+        return (self.username, self.user_id, self.full_name)
+
+    def to_dict(self):
+        return {"username": self.username, "user_id": self.user_id, "full_name": self.full_name}
+
+
+class StringColumn:
+    """Append-only strings stored as one UTF-8 buffer plus end offsets"""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.ends = array('Q')
+
+    def append(self, value):
+        self.data += (value or "").encode('utf-8')
+        self.ends.append(len(self.data))
+
+    def __getitem__(self, idx):
+        start = self.ends[idx - 1] if idx else 0
+        return self.data[start:self.ends[idx]].decode('utf-8')
+
+    def __iter__(self):
+        start = 0
+        data = memoryview(self.data)
+        for end in self.ends:
+            yield bytes(data[start:end]).decode('utf-8')
+            start = end
+
+    @property
+    def nbytes(self):
+        return len(self.data) + self.ends.itemsize * len(self.ends)
+
+
+class FollowerList:
+    """Columnar, array-backed list of follower/following records
+
+    User ids live in an array of 64-bit ints and names in UTF-8 string
+    columns, so a record costs a few dozen bytes instead of a dict with
+    three separate objects. Indexing and iteration return FollowerRecord
+    objects, and slicing returns a new FollowerList. Empty full names come
+    back as "". `complete` is False when the crawl behind the list did not
+    return every record (limit, incremental sync or error)."""
+
+    def __init__(self, records=(), complete=True):
+        self.user_ids = array('q')
+        self.usernames = StringColumn()
+        self.full_names = StringColumn()
+        self.complete = complete
+        self.extend(records)
+
+    def append(self, record):
+        """Add a FollowerRecord, dict or (username, user_id, full_name) tuple"""
+        if isinstance(record, tuple):
+            username, user_id, full_name = record
+        else:
+            username, user_id, full_name = record.get("username"), record.get("user_id"), record.get("full_name")
+        self.usernames.append(username)
+        self.user_ids.append(_NO_ID if user_id is None else int(user_id))
+        self.full_names.append(full_name)
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    def _user_id(self, idx):
+        user_id = self.user_ids[idx]
+        return None if user_id == _NO_ID else user_id
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return FollowerList(self.rows(idx))
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("FollowerList index out of range")
+        return FollowerRecord(self.usernames[idx], self._user_id(idx), self.full_names[idx])
+
+    def rows(self, selection=None):
+        """Yield (username, user_id, full_name) tuples, optionally for a slice"""
+        if selection is None:
+            for username, user_id, full_name in zip(self.usernames, self.user_ids, self.full_names):
+                yield username, None if user_id == _NO_ID else user_id, full_name
+            return
+        for idx in range(*selection.indices(len(self))):
+            yield self.usernames[idx], self._user_id(idx), self.full_names[idx]
+
+    def __iter__(self):
+        for row in self.rows():
+            yield FollowerRecord(*row)
+
+    def __eq__(self, other):
+        if isinstance(other, (FollowerList, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"FollowerList({len(self)} records)"
+
+    def to_dicts(self):
+        """Records as a list of plain dicts"""
+        return [dict(zip(FIELDS, row)) for row in self.rows()]
+
+    @property
+    def nbytes(self):
+        """Approximate memory used by the columns"""
+        return self.user_ids.itemsize * len(self.user_ids) + self.usernames.nbytes + self.full_names.nbytes
+
+
+def iter_rows(records):
+    """(username, user_id, full_name) tuples from any follower collection"""
+    if isinstance(records, FollowerList):
+        return records.rows()
+    return ((r.get("username"), r.get("user_id"), r.get("full_name")) for r in records)
+
+
+def iter_usernames(records):
+    """Usernames from any follower collection"""
+    if isinstance(records, FollowerList):
+        return iter(records.usernames)
+    return (r["username"] for r in records)
+
+
+def record_dict(record):
+    """Plain dict for a FollowerRecord or follower dict"""
+    return record.to_dict() if isinstance(record, FollowerRecord) else record
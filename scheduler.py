@@ -0,0 +1,71 @@
+"""Staleness- and cost-aware ordering of target lists"""
+
+import math
+from datetime import datetime
+from database import OsintDatabase
+
+PAGE_SIZE = 12  # Records per follower/following/post page request
+
+
+def normalize_target(target):
+    """Username as stored in the database"""
+    return target.strip().lstrip('@').lower()
+
+
+class TargetScheduler:
+    """Order targets so the request budget goes to the stalest data first
+
+    Targets are deduplicated and those updated within `fresh_within` are
+    skipped. The rest are ranked by staleness per expected request:
+    profiles never stored come first, then the highest ratio of seconds
+    since `profiles.last_updated` to estimated crawl cost, which is based
+    on the stored follower, following and post counts and the run's
+    limits."""
+
+    def __init__(self, db=None, fresh_within=None, now=None):
+        self.db = db or OsintDatabase()
+        self.fresh_within = fresh_within  # timedelta or None
+        self.now = now or datetime.now()
+        self.duplicates = 0
+        self.skipped_fresh = []
+
+    @staticmethod
+    def estimate_cost(stats, options):
+        """Expected number of requests to process a stored profile"""
+        followers = stats["followers"]
+        following = stats["following"]
+        if options.get('limit_followers'):
+            followers = min(followers, options['limit_followers'])
+        if options.get('limit_following'):
+            following = min(following, options['limit_following'])
+        cost = 1 + math.ceil(followers / PAGE_SIZE) + math.ceil(following / PAGE_SIZE)
+        if not options.get('no_download'):
+            cost += math.ceil(stats["posts"] / PAGE_SIZE)
+        return cost
+
+    def schedule(self, targets, options=None):
+        """Return the deduplicated, filtered and ordered target list"""
+        options = options or {}
+        unique = list(dict.fromkeys(normalize_target(t) for t in targets if t.strip()))
+        self.duplicates = len(targets) - len(unique)
+        stats = self.db.get_target_stats(unique)
+
+        ranked = []
+        self.skipped_fresh = []
+        for position, target in enumerate(unique):
+            target_stats = stats.get(target)
+            last_updated = target_stats["last_updated"] if target_stats else None
+            if last_updated is None:
+                # Never stored, most out of date
+                ranked.append((0, 0, position, target))
+                continue
+
+            age = self.now - last_updated
+            if self.fresh_within and age < self.fresh_within:
+                self.skipped_fresh.append(target)
+                continue
+            priority = age.total_seconds() / self.estimate_cost(target_stats, options)
+            ranked.append((1, -priority, position, target))
+
+        ranked.sort()
+        return [target for *_, target in ranked]
@@ -0,0 +1,123 @@
+"""Multi-account session pool for Instagram OSINT"""
+
+import threading
+import time
+from processor import InstagramOSINT
+from ratelimit import TokenBucket
+from utils import print_info, print_warning, print_success
+
+DEFAULT_SESSION_TARGETS_PER_MINUTE = 10
+DEFAULT_QUARANTINE = 900  # Seconds a throttled session sits out (doubles on repeat)
+
+
+class PooledSession:
+    """One logged-in InstagramOSINT with its own budget and quarantine state"""
+
+    def __init__(self, osint, targets_per_minute):
+        self.osint = osint
+        self.bucket = TokenBucket.per_minute(targets_per_minute)
+        self.quarantined_until = 0
+        self.strikes = 0
+        self.processed = 0
+
+    @property
+    def name(self):
+        return self.osint.username
+
+
+class SessionPool:
+    """Spread targets over several saved sessions
+
+    Each target goes to a session that still has budget left. Sessions
+    that get throttled or challenged are quarantined and the target is
+    retried on another account."""
+
+    def __init__(self, sessions, targets_per_minute=DEFAULT_SESSION_TARGETS_PER_MINUTE,
+                 quarantine=DEFAULT_QUARANTINE, quiet=False):
+        self.sessions = [PooledSession(osint, targets_per_minute) for osint in sessions]
+        self.quarantine = quarantine
+        self.quiet = quiet
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_saved_sessions(cls, usernames, primary=None, quiet=False, **kwargs):
+        """Load saved sessions through InstagramOSINT.load_session
+
+        `primary` (an already authenticated InstagramOSINT) joins the pool.
+        Remaining keyword arguments configure the pool itself, except
+        `osint_options` which is passed to each InstagramOSINT."""
+        osint_options = kwargs.pop('osint_options', {})
+        sessions = [primary] if primary else []
+        for username in usernames:
+            if primary and username == primary.username:
+                continue
+            osint = InstagramOSINT(username, use_session=True, quiet=quiet, **osint_options)
+            if osint.load_session():
+                sessions.append(osint)
+            elif not quiet:
+                print_warning(f"No saved session for {username}, skipping")
+
+        if not quiet:
+            print_info(f"Session pool: {len(sessions)} account(s)")
+        return cls(sessions, quiet=quiet, **kwargs)
+
+    def ready_at(self, session):
+        """When the session may take targets again"""
+        # A session still retrying a 429 inside instaloader sits out before release() sees it
+        return max(session.quarantined_until, session.osint.throttled_at + self.quarantine)
+
+    def acquire(self):
+        """Block until a non-quarantined session has budget and return it"""
+        if not self.sessions:
+            raise RuntimeError("Session pool is empty")
+
+        while True:
+            now = time.time()
+            with self.lock:
+                available = [s for s in self.sessions if self.ready_at(s) <= now]
+                # Least used first so work spreads evenly
+                for session in sorted(available, key=lambda s: s.processed):
+                    if session.bucket.try_acquire():
+                        session.processed += 1
+                        return session
+                wake = min(self.ready_at(s) for s in self.sessions) if not available else now + 0.5
+            time.sleep(max(min(wake - now, 5), 0.1))
+
+    def release(self, session, started):
+        """Quarantine the session if it was throttled since `started`"""
+        if session.osint.throttled_at < started:
+            with self.lock:
+                session.strikes = 0
+            return False
+
+        with self.lock:
+            session.strikes += 1
+            duration = self.quarantine * 2 ** (session.strikes - 1)
+            session.quarantined_until = time.time() + duration
+        if not self.quiet:
+            print_warning(f"Session {session.name} throttled, quarantined for {duration}s")
+        return True
+
+    def process(self, target, options=None):
+        """Run the pipeline for a target on the next available session"""
+        for _ in range(len(self.sessions)):
+            session = self.acquire()
+            started = time.time()
+            result = session.osint.run_pipeline(target, options)
+            throttled = self.release(session, started)
+            if result or not throttled:
+                return result
+        return None
+
+    def batch_process(self, target_list, options=None, on_result=None):
+        """Batch-process targets with each one routed through the pool"""
+        return self.sessions[0].osint.batch_process(target_list, options, on_result, runner=self.process)
+
+    def print_summary(self):
+        """Print per-session usage"""
+        if self.quiet:
+            return
+        now = time.time()
+        for session in self.sessions:
+            state = "quarantined" if self.ready_at(session) > now else "ok"
+            print_success(f"Session {session.name}: {session.processed} target(s), {state}")
@@ -0,0 +1,104 @@
+"""Queue-driven worker daemon for Instagram OSINT"""
+
+import socket
+import time
+from database import OsintDatabase
+from utils import print_info, print_warning, print_success, print_header
+
+DEFAULT_POLL_INTERVAL = 5  # Seconds between queue checks when idle
+DEFAULT_MAX_ATTEMPTS = 3
+THROTTLE_BACKOFF = 300  # Seconds to pause after a job hit throttling
+
+# Processing options a job can carry from --enqueue
+JOB_OPTION_KEYS = ('analyze', 'db', 'incremental', 'no_download', 'limit_followers',
+                   'limit_following', 'stream', 'chunk_size', 'export_formats')
+
+
+def job_options(options):
+    """Subset of CLI options stored with an enqueued job"""
+    return {key: options[key] for key in JOB_OPTION_KEYS if key in options}
+
+
+class QueueWorker:
+    """Process jobs from the database queue with one logged-in session
+
+    The InstagramOSINT instance (loader, session, profile cache) stays
+    alive between jobs. `runner(target, options)` and `export(result,
+    target, formats)` default to the instance's run_pipeline and
+    export_results. Failed jobs are retried up to `max_attempts`
+    times; after a throttled job the worker pauses before the next one."""
+
+    def __init__(self, osint, options, runner=None, export=None, db=None, poll_interval=DEFAULT_POLL_INTERVAL,
+                 max_attempts=DEFAULT_MAX_ATTEMPTS, name=None, quiet=False):
+        self.osint = osint
+        self.options = options
+        self.runner = runner or osint.run_pipeline
+        self.export = export or osint.export_results
+        self.db = db or OsintDatabase()
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.name = name or f"{socket.gethostname()}:{osint.username or 'anonymous'}"
+        self.quiet = quiet
+        self.processed = 0
+        self.failed = 0
+
+    def process_job(self, job):
+        """Run the pipeline and exports for one claimed job"""
+        options = {**self.options, **job["options"]}
+        started = time.time()
+        try:
+            result = self.runner(job["target"], options)
+            if result:
+                self.export(result, job["target"], options.get('export_formats', 'json'))
+                self.db.finish_job(job["id"], 'done')
+                self.processed += 1
+                return
+            error = "Profile could not be processed"
+        except Exception as e:
+            error = str(e)
+
+        throttled = self.osint.throttled_at >= started
+        retry = job["attempts"] < self.max_attempts
+        self.db.finish_job(job["id"], 'pending' if retry else 'failed', error)
+        self.failed += 1
+        if not self.quiet:
+            print_warning(f"Job {job['id']} ({job['target']}) failed: {error}"
+                          + (" - will retry" if retry else ""))
+        if throttled:
+            if not self.quiet:
+                print_warning(f"Session throttled, pausing {THROTTLE_BACKOFF}s")
+            time.sleep(THROTTLE_BACKOFF)
+
+    def run(self, exit_when_idle=False, max_jobs=None):
+        """Claim and process jobs until interrupted (or the queue is empty)"""
+        recovered = self.db.requeue_stale_jobs(self.name)
+        if not self.quiet:
+            print_header(f"WORKER {self.name}")
+            if recovered:
+                print_info(f"Requeued {recovered} job(s) left running by a previous run")
+
+        job = None
+        try:
+            while max_jobs is None or self.processed + self.failed < max_jobs:
+                job = self.db.claim_job(self.name)
+                if not job:
+                    if exit_when_idle:
+                        break
+                    time.sleep(self.poll_interval)
+                    continue
+
+                if not self.quiet:
+                    print_info(f"Job {job['id']}: {job['target']} (attempt {job['attempts']})")
+                self.process_job(job)
+                job = None
+        except KeyboardInterrupt:
+            if job:
+                # Interrupted mid-job, let the next run pick it up again
+                self.db.finish_job(job["id"], 'pending', "interrupted")
+            if not self.quiet:
+                print_warning("Worker stopped")
+        finally:
+            if not self.quiet:
+                counts = self.db.get_job_counts()
+                print_success(f"Worker processed {self.processed} job(s), {self.failed} failed attempt(s)")
+                print_info("Queue: " + ", ".join(f"{count} {status}" for status, count in sorted(counts.items())))